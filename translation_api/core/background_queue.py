@@ -0,0 +1,89 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, List, Optional
+
+Job = Callable[[], Awaitable[None]]
+
+
+class BackgroundQueue:
+    """
+    Bounded queue of async jobs run by a fixed pool of worker tasks.
+
+    A failed job is retried up to `max_retries` times with jittered
+    exponential backoff, then dropped and counted. `submit` never waits:
+    it returns False when the queue is full so the caller can apply
+    backpressure. `drain` lets queued jobs finish on shutdown.
+    """
+
+    def __init__(self, max_size: int, workers: int, max_retries: int, backoff: float):
+        self.max_size = max_size
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        """Start the workers (called from the app lifespan, or on first submit)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_size)
+        if not self._tasks:
+            self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    def submit(self, job: Job) -> bool:
+        """Queue `job`; return False without queueing if the queue is full."""
+        self.start()
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return False
+        return True
+
+    async def _work(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                await job()
+                self.completed += 1
+                return
+            except Exception as e:
+                if attempt == self.max_retries:
+                    self.failed += 1
+                    print(f"Background job failed after {attempt + 1} attempts: {e}")
+                    return
+                self.retried += 1
+                await asyncio.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    async def drain(self, timeout: float) -> None:
+        """Wait up to `timeout` seconds for queued jobs, then stop the workers."""
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                print(f"Dropping {self._queue.qsize()} queued background jobs on shutdown")
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "completed": self.completed,
+            "retried": self.retried,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
@@ -0,0 +1,92 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Bounded in-memory LRU cache whose entries expire after `ttl` seconds.
+
+    Bounded by entry count and, when `max_bytes` is set, by the total of
+    `sizeof(key, value)` over all entries. Keeps hit/miss/eviction counters
+    so callers can expose them as metrics.
+    """
+
+    def __init__(self, max_size: int, ttl: float, max_bytes: Optional[int] = None,
+                 sizeof: Optional[Callable[[Hashable, Any], int]] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or (lambda key, value: 0)
+        self._data: "OrderedDict[Hashable, tuple[float, Any, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or `default` if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        if self.max_size <= 0:
+            return
+        size = self.sizeof(key, value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        self._remove(key)
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value, size)
+        self.bytes += size
+        while len(self._data) > self.max_size or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._data))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a single entry if present."""
+        self._remove(key)
+
+    def delete_matching(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key satisfies `predicate`."""
+        keys = [key for key in self._data if predicate(key)]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        return {
+            "size": len(self._data),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
@@ -1,7 +1,12 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
+from pathlib import Path
 from typing import List
+import os
 import secrets
 
+APP_ROOT = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -20,21 +25,123 @@ class Settings(BaseSettings):
     SECRET_KEY: str  # Must be set in .env
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 10080  # 7 days
+    # Trust valid JWTs locally and serve the user record from a short-TTL cache
+    AUTH_TRUST_LOCAL_JWT: bool = True
+    AUTH_USER_CACHE_TTL_SECONDS: int = 60  # Maximum staleness of a cached user
+    AUTH_USER_CACHE_MAX_SIZE: int = 10000
 
     # PocketBase Configuration
     POCKETBASE_URL: str = "http://localhost:8090"
     POCKETBASE_EMAIL: str  # Must be set in .env
     POCKETBASE_PASSWORD: str  # Must be set in .env
+    # Refresh the cached superuser token this many seconds before it expires
+    POCKETBASE_ADMIN_TOKEN_REFRESH_MARGIN: int = 300
+    # Retries for vocabulary upserts that lose a write race
+    POCKETBASE_UPSERT_MAX_RETRIES: int = 5
+    POCKETBASE_UPSERT_RETRY_BACKOFF: float = 0.05  # seconds, doubled per attempt
+
+    # Stats: IANA timezone for "today"/"this week" when the client sends none
+    STATS_DEFAULT_TIMEZONE: str = "UTC"
 
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["*"]
 
+    # Shared SQLite files below are resolved against this directory when
+    # relative, so every worker on the host opens the same file whatever
+    # its working directory
+    DATA_DIR: str = str(APP_ROOT / "data")
+
     # Rate Limiting
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # Bearer token for /metrics; without one it is served to loopback clients only
+    METRICS_TOKEN: str = ""
+
     # Papago API (Defaults are placeholders, override in .env)
     PAPAGO_CLIENT_ID: str = ""
     PAPAGO_CLIENT_SECRET: str = ""
+    PAPAGO_URL: str = "https://openapi.naver.com/v1/papago/n2mt"
+    PAPAGO_MAX_CHARS: int = 5000  # Papago's per-request text limit
+    # Shared outbound connection pool (HTTP/2 is used when `h2` is installed)
+    PAPAGO_HTTP2: bool = True
+    PAPAGO_MAX_CONNECTIONS: int = 100
+    PAPAGO_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    PAPAGO_KEEPALIVE_EXPIRY: float = 60.0  # seconds
+    PAPAGO_CONNECT_TIMEOUT: float = 3.0  # seconds
+    PAPAGO_READ_TIMEOUT: float = 10.0  # seconds
+    # Outbound quota, metered across workers through a shared SQLite file
+    PAPAGO_DAILY_CHAR_LIMIT: int = 1_000_000  # 0 disables character metering
+    PAPAGO_QUOTA_RESET_TIMEZONE: str = "Asia/Seoul"  # Papago's daily quota resets at midnight here
+    PAPAGO_CALLS_PER_SECOND: float = 10.0  # 0 disables call metering
+    PAPAGO_QUOTA_DB_PATH: str = "papago_quota.sqlite3"  # "" keeps the budget per worker
+    PAPAGO_QUOTA_MAX_WAIT: float = 2.0  # seconds a request may queue for budget
+    PAPAGO_BULK_RESERVE_RATIO: float = 0.1  # daily characters kept for interactive use
+
+    # Translation providers, tried in order ("papago", "dictionary")
+    TRANSLATION_PROVIDERS: List[str] = ["papago"]
+    TRANSLATION_DICTIONARY_PATH: str = ""  # JSON phrase table for "dictionary"
+    TRANSLATION_CIRCUIT_FAILURE_THRESHOLD: int = 5  # Consecutive failures to open
+    TRANSLATION_CIRCUIT_RESET_SECONDS: float = 30.0
+    # Race the next provider when the first is slower than its recent pXX
+    TRANSLATION_HEDGE_ENABLED: bool = False
+    TRANSLATION_HEDGE_PERCENTILE: float = 95.0
+    TRANSLATION_HEDGE_MIN_SAMPLES: int = 20
+
+    # Fuzzy translation memory over provider translations, shared by all users
+    TRANSLATION_MEMORY_THRESHOLD: float = 0.85  # Minimum character-bigram Jaccard similarity
+    TRANSLATION_MEMORY_MAX_ENTRIES: int = 100000  # 0 disables the memory
+    TRANSLATION_MEMORY_LOAD_ENTRIES: int = 20000  # Cached translations indexed at startup
+    TRANSLATION_MEMORY_MAX_TEXT_CHARS: int = 500  # Longer texts skip the memory
+
+    # Background saves from /translations/proxy?save
+    PERSIST_QUEUE_MAX_SIZE: int = 1000
+    PERSIST_QUEUE_WORKERS: int = 4
+    PERSIST_QUEUE_MAX_RETRIES: int = 3
+    PERSIST_QUEUE_RETRY_BACKOFF: float = 0.5  # seconds, doubled per retry
+    PERSIST_QUEUE_DRAIN_TIMEOUT: float = 10.0  # seconds to finish queued saves on shutdown
+
+    # Korean word extraction, off the event loop
+    KOREAN_ANALYZER_BACKEND: str = "okt"  # "okt", "kiwi" (no JVM) or "hangul" (pure Python)
+    KOREAN_EXTRACTOR_WORKERS: int = 2
+    KOREAN_EXTRACTOR_MAX_PENDING: int = 32  # Beyond this, use the regex extractor
+    KOREAN_EXTRACTOR_TIMEOUT: float = 2.0  # seconds before falling back to regex
+    # Start the analyzer (a JVM for Okt) in every API worker on startup; only
+    # worth it where routes extract in-process. The sidecar warms up its own.
+    KOREAN_EXTRACTOR_WARMUP: bool = False
+    KOREAN_EXTRACTOR_PROCESSES: int = 0  # Batch extraction processes, 0 for one per CPU
+    KOREAN_EXTRACTOR_CHUNK_SIZE: int = 200  # Texts per batch extraction task
+    KOREAN_EXTRACTOR_SIDECAR_SOCKET: str = ""  # e.g. "/run/langxc/extractor.sock" to analyze in the sidecar
+    KOREAN_EXTRACTOR_SIDECAR_TIMEOUT: float = 1.0  # seconds before falling back to regex
+    KOREAN_EXTRACTOR_SIDECAR_RETRY_SECONDS: float = 5.0  # Wait after a failed connect
+    KOREAN_EXTRACTOR_SIDECAR_MAX_BATCH: int = 64  # Texts analyzed per call in the sidecar
+    KOREAN_EXTRACTOR_SIDECAR_MAX_DELAY: float = 0.002  # seconds to wait for a batch to fill
+    KOREAN_POS_CACHE_MAX_ENTRIES: int = 50000
+    KOREAN_POS_CACHE_MAX_BYTES: int = 32 * 1024 * 1024
+    KOREAN_POS_CACHE_TTL_SECONDS: int = 30 * 24 * 60 * 60
+    KOREAN_POS_CACHE_DB_PATH: str = ""  # e.g. "pos_cache.sqlite3" to keep tags across restarts
+    KOREAN_POS_CACHE_DB_MAX_ENTRIES: int = 1_000_000
+
+    # Batch translation
+    TRANSLATION_BATCH_MAX_TEXTS: int = 500
+    TRANSLATION_BATCH_CONCURRENCY: int = 4  # Papago requests in flight per batch
+    TRANSLATION_STREAM_WINDOW: int = 4  # Segments translated ahead per stream
+
+    # Translation result cache
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 50000
+    TRANSLATION_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TRANSLATION_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    # Shared SQLite tier used by all workers on the host ("" disables it)
+    TRANSLATION_CACHE_DB_PATH: str = "translation_cache.sqlite3"
+    TRANSLATION_CACHE_DB_MAX_ENTRIES: int = 1_000_000
+    TRANSLATION_CACHE_WARM_ENTRIES: int = 10000  # loaded into memory at startup
+
+    @model_validator(mode="after")
+    def _resolve_db_paths(self) -> "Settings":
+        for name in ("PAPAGO_QUOTA_DB_PATH", "KOREAN_POS_CACHE_DB_PATH", "TRANSLATION_CACHE_DB_PATH"):
+            path = getattr(self, name)
+            if path and path != ":memory:" and not os.path.isabs(path):
+                setattr(self, name, os.path.join(self.DATA_DIR, path))
+        return self
 
 
 settings = Settings()
@@ -0,0 +1,112 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class SQLiteCache:
+    """
+    Persistent string key/value cache in a local SQLite database.
+
+    The database runs in WAL mode, so every gunicorn worker on the host can
+    open the same file: readers never block each other or the writer, and
+    writers wait up to `busy_timeout` seconds for the lock. Entries expire
+    after `ttl` seconds; once more than `max_entries` are stored, the ones
+    closest to expiry are pruned. Calls are blocking; async callers should
+    run them in a thread.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int,
+                 prune_interval: int = 500, busy_timeout: float = 5.0):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.prune_interval = prune_interval
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at)")
+            self._conn = conn
+        return self._conn
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, float]]:
+        """Return `(value, seconds left)` for a live entry, or None."""
+        now = time.time()
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return row[0], row[1] - now
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self.get_entry(key)
+        return entry[0] if entry else None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value, pruning expired and excess entries periodically."""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, expires_at)
+            )
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                self._prune(conn)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM cache WHERE key IN ("
+            "SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def recent(self, limit: int) -> List[Tuple[str, str, float]]:
+        """Return up to `limit` live `(key, value, seconds left)`, newest first."""
+        now = time.time()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT key, value, expires_at FROM cache WHERE expires_at > ? "
+                "ORDER BY expires_at DESC LIMIT ?",
+                (now, limit)
+            ).fetchall()
+        return [(key, value, expires_at - now) for key, value, expires_at in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return this process's counters for the shared cache."""
+        return {"hits": self.hits, "misses": self.misses, "writes": self._writes}
@@ -1,6 +1,117 @@
+import asyncio
+import hashlib
+import random
+import secrets
+import string
+import time
+from datetime import datetime, timezone
 import httpx
-from typing import Dict, List, Optional, Any
+from jose import JWTError, jwt
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Any
+from core.cache import TTLCache
 from core.config import settings
+from core.singleflight import SingleFlight
+
+# Vocabulary rows created before deterministic ids, remembered once found
+LEGACY_VOCABULARY_IDS_MAX = 10000
+LEGACY_VOCABULARY_IDS_TTL = 24 * 3600
+
+
+def filter_literal(value: str) -> str:
+    """Quote a value for use inside a PocketBase filter expression."""
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def format_datetime(value: datetime) -> str:
+    """Format a datetime the way PocketBase stores it ("2024-01-01 10:00:00.000Z")."""
+    utc = value.astimezone(timezone.utc)
+    return utc.strftime("%Y-%m-%d %H:%M:%S.") + f"{utc.microsecond // 1000:03d}Z"
+
+
+def parse_datetime(value: str) -> datetime:
+    """Parse a PocketBase datetime string into an aware UTC datetime."""
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def filter_datetime(value: datetime) -> str:
+    """Format a datetime as a quoted PocketBase filter literal (UTC)."""
+    return filter_literal(format_datetime(value))
+
+
+def _list_params(filter: str, sort: str, page: int, per_page: int,
+                 fields: Optional[List[str]] = None, skip_total: bool = False) -> Dict[str, Any]:
+    """Build query parameters for a PocketBase records list request."""
+    params: Dict[str, Any] = {
+        "filter": filter,
+        "sort": sort,
+        "page": page,
+        "perPage": per_page
+    }
+    if fields:
+        params["fields"] = ",".join(fields)
+    if skip_total:
+        params["skipTotal"] = 1
+    return params
+
+
+def is_write_conflict(response: httpx.Response) -> bool:
+    """
+    Whether a failed batch lost a race with another write: a 409, or a
+    unique index rejecting a row that a concurrent request just created.
+    Anything else (validation errors, a disabled batch API) is permanent.
+    """
+    if response.status_code == 409:
+        return True
+    return response.status_code == 400 and (
+        "validation_not_unique" in response.text or "UNIQUE constraint failed" in response.text
+    )
+
+
+def new_record_id() -> str:
+    """Random 15-char record id in PocketBase's own format."""
+    alphabet = string.ascii_lowercase + string.digits
+    return "".join(secrets.choice(alphabet) for _ in range(15))
+
+
+def vocabulary_record_id(user_id: str, word: str, source_lang: str, target_lang: str) -> str:
+    """Deterministic 15-char record id for a user's vocabulary entry."""
+    key = "\x1f".join((user_id, word, source_lang, target_lang))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:15]
+
+
+# Stats rollups are counted per 15-minute UTC slot. Every timezone offset is
+# a multiple of 15 minutes, so local day boundaries always fall on a slot.
+STATS_SLOT_MINUTES = 15
+
+
+def stats_slot(value: datetime) -> str:
+    """PocketBase datetime of the stats slot containing `value`."""
+    utc = value.astimezone(timezone.utc)
+    minute = utc.minute - utc.minute % STATS_SLOT_MINUTES
+    return format_datetime(utc.replace(minute=minute, second=0, microsecond=0))
+
+
+def stats_upsert_request(user_id: str, slot: str, source_lang: str, target_lang: str,
+                         **counts: int) -> Dict[str, Any]:
+    """
+    Batch request upserting one stats rollup row.
+
+    `slot` is a `stats_slot()` value, or "" for the all-time row of the
+    direction. `counts` is e.g. `{"count+": 1}` or `{"count": 42}`.
+    """
+    key = "\x1f".join((user_id, slot, source_lang, target_lang))
+    return {
+        "method": "PUT",
+        "url": "/api/collections/translation_stats/records",
+        "body": {
+            "id": hashlib.sha256(key.encode("utf-8")).hexdigest()[:15],
+            "user": user_id,
+            "slot": slot,
+            "source_lang": source_lang,
+            "target_lang": target_lang,
+            **counts
+        }
+    }
 
 
 class PocketBaseClient:
@@ -8,6 +119,14 @@ class PocketBaseClient:
         self.base_url = settings.POCKETBASE_URL.rstrip('/')
         self.client = httpx.AsyncClient(timeout=30.0)
         self.admin_token: Optional[str] = None
+        self.admin_token_expires_at: float = 0.0
+        self._admin_refresh: Optional[asyncio.Task] = None
+        # Identical concurrent list reads share one request
+        self.read_flight = SingleFlight()
+        # Natural key -> random id of vocabulary rows predating deterministic ids
+        self.legacy_vocabulary_ids = TTLCache(
+            max_size=LEGACY_VOCABULARY_IDS_MAX, ttl=LEGACY_VOCABULARY_IDS_TTL
+        )
 
     async def __aenter__(self):
         return self
@@ -16,10 +135,47 @@ class PocketBaseClient:
         pass
 
     async def close(self):
+        if self._admin_refresh and not self._admin_refresh.done():
+            self._admin_refresh.cancel()
         await self.client.aclose()
 
-    async def authenticate_admin(self) -> str:
-        """Authenticate as admin and return token."""
+    async def authenticate_admin(self, force: bool = False) -> str:
+        """
+        Return a valid superuser token, authenticating only when needed.
+
+        The token is cached until shortly before it expires. Inside the
+        refresh margin the cached token is still returned while a refresh
+        runs in the background; concurrent callers share one in-flight
+        auth request.
+        """
+        remaining = self.admin_token_expires_at - time.time()
+        if self.admin_token and not force and remaining > 0:
+            if remaining <= settings.POCKETBASE_ADMIN_TOKEN_REFRESH_MARGIN:
+                self._start_admin_refresh()
+            return self.admin_token
+
+        return await asyncio.shield(self._start_admin_refresh())
+
+    def invalidate_admin_token(self) -> None:
+        """Drop the cached superuser token so the next call re-authenticates."""
+        self.admin_token = None
+        self.admin_token_expires_at = 0.0
+
+    def _start_admin_refresh(self) -> asyncio.Task:
+        """Start a superuser auth request unless one is already in flight."""
+        if self._admin_refresh is None or self._admin_refresh.done():
+            self._admin_refresh = asyncio.create_task(self._refresh_admin_token())
+            self._admin_refresh.add_done_callback(self._on_admin_refresh_done)
+        return self._admin_refresh
+
+    @staticmethod
+    def _on_admin_refresh_done(task: asyncio.Task) -> None:
+        # Background refreshes have no awaiter; surface their failures here
+        if not task.cancelled() and task.exception() is not None:
+            print(f"PocketBase admin token refresh failed: {task.exception()}")
+
+    async def _refresh_admin_token(self) -> str:
+        """Authenticate as superuser and cache the token with its expiry."""
         # PocketBase v0.23+ uses _superusers collection instead of admins
         response = await self.client.post(
             f"{self.base_url}/api/collections/_superusers/auth-with-password",
@@ -29,31 +185,59 @@ class PocketBaseClient:
             }
         )
         response.raise_for_status()
-        data = response.json()
-        self.admin_token = data["token"]
-        return self.admin_token
+        token = response.json()["token"]
+        self.admin_token = token
+        self.admin_token_expires_at = self._token_expiry(token)
+        return token
+
+    @staticmethod
+    def _token_expiry(token: str) -> float:
+        """Read the `exp` claim of a PocketBase token without verifying it."""
+        try:
+            exp = jwt.get_unverified_claims(token).get("exp")
+        except JWTError:
+            exp = None
+        if exp is None:
+            # Unknown lifetime: keep the token for one refresh margin only
+            return time.time() + settings.POCKETBASE_ADMIN_TOKEN_REFRESH_MARGIN
+        return float(exp)
 
     async def _get_headers(self, user_token: Optional[str] = None) -> Dict[str, str]:
-        """Get headers for requests."""
+        """Get headers for requests, falling back to the cached admin token."""
         headers = {"Content-Type": "application/json"}
         if user_token:
             headers["Authorization"] = f"Bearer {user_token}"
-        elif self.admin_token:
-            headers["Authorization"] = f"Bearer {self.admin_token}"
+        else:
+            headers["Authorization"] = f"Bearer {await self.authenticate_admin()}"
         return headers
 
+    async def _send(self, method: str, url: str, token: Optional[str] = None, **kwargs) -> httpx.Response:
+        """
+        Send a request with `token`, or as superuser without one.
+
+        A superuser request answered with 401 means the cached token was
+        revoked server-side: it is dropped and the request retried once.
+        """
+        headers = await self._get_headers(token)
+        response = await self.client.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 401 and not token:
+            # Unless a concurrent request already replaced it
+            if headers["Authorization"] == f"Bearer {self.admin_token}":
+                self.invalidate_admin_token()
+            response = await self.client.request(method, url, headers=await self._get_headers(token), **kwargs)
+        return response
+
     # Users collection methods
     async def create_user(self, email: str, password: str, display_name: str = "") -> Dict[str, Any]:
         """Create a new user."""
-        response = await self.client.post(
-            f"{self.base_url}/api/collections/users/records",
+        response = await self._send(
+            "POST", f"{self.base_url}/api/collections/users/records",
             json={
                 "email": email,
                 "password": password,
                 "passwordConfirm": password,
                 "name": display_name
-            },
-            headers=await self._get_headers()
+            }
         )
         response.raise_for_status()
         return response.json()
@@ -72,9 +256,9 @@ class PocketBaseClient:
 
     async def get_user(self, user_id: str, token: str) -> Dict[str, Any]:
         """Get user by ID."""
-        response = await self.client.get(
-            f"{self.base_url}/api/collections/users/records/{user_id}",
-            headers=await self._get_headers(token)
+        response = await self._send(
+            "GET", f"{self.base_url}/api/collections/users/records/{user_id}",
+            token=token
         )
         response.raise_for_status()
         return response.json()
@@ -83,8 +267,8 @@ class PocketBaseClient:
     async def create_translation(self, user_id: str, source_text: str, translated_text: str, 
                                source_lang: str, target_lang: str, token: str) -> Dict[str, Any]:
         """Create a new translation."""
-        response = await self.client.post(
-            f"{self.base_url}/api/collections/translations/records",
+        response = await self._send(
+            "POST", f"{self.base_url}/api/collections/translations/records",
             json={
                 "user": user_id,
                 "source_text": source_text,
@@ -92,122 +276,375 @@ class PocketBaseClient:
                 "source_lang": source_lang,
                 "target_lang": target_lang
             },
-            headers=await self._get_headers(token)
+            token=token
         )
         response.raise_for_status()
         return response.json()
 
-    async def get_user_translations(self, user_id: str, token: str, page: int = 1, per_page: int = 50) -> Dict[str, Any]:
-        """Get user's translations with pagination."""
-        response = await self.client.get(
-            f"{self.base_url}/api/collections/translations/records",
-            params={
-                "filter": f"user.id='{user_id}'",
-                "sort": "-created",
-                "page": page,
-                "perPage": per_page
-            },
-            headers=await self._get_headers(token)
+    async def get_user_translations(self, user_id: str, token: str, page: int = 1, per_page: int = 50,
+                                    fields: Optional[List[str]] = None,
+                                    skip_total: bool = False) -> Dict[str, Any]:
+        """
+        Get user's translations with pagination.
+
+        `fields` limits the returned record fields; `skip_total` skips the
+        COUNT query behind `totalItems`/`totalPages` (both are then -1).
+        """
+        return await self._coalesced_get(
+            "translations", token,
+            _list_params(f"user.id={filter_literal(user_id)}", "-created", page, per_page,
+                         fields, skip_total)
         )
-        response.raise_for_status()
-        return response.json()
 
     async def delete_translation(self, translation_id: str, token: str) -> bool:
-        """Delete a translation."""
-        response = await self.client.delete(
-            f"{self.base_url}/api/collections/translations/records/{translation_id}",
-            headers=await self._get_headers(token)
+        """Delete a translation and decrement its stats rollups atomically."""
+        record = await self._get_translation(translation_id, token)
+        if record is None:
+            return False
+
+        try:
+            # As superuser, since users can't write stats rollups; the read
+            # above already checked the record is visible to `token`
+            await self.batch_with_retry([
+                {
+                    "method": "DELETE",
+                    "url": f"/api/collections/translations/records/{translation_id}"
+                },
+                *self._stats_requests(record["user"], parse_datetime(record["created"]),
+                                      record["source_lang"], record["target_lang"], -1)
+            ], "")
+        except httpx.HTTPStatusError:
+            # A concurrent delete won the race, so the batch failed on the missing record
+            if await self._get_translation(translation_id, token) is None:
+                return False
+            raise
+        return True
+
+    async def translation_exists(self, translation_id: str) -> bool:
+        """Whether a translation record exists, checked as superuser like the save itself."""
+        return await self._get_translation(translation_id, "") is not None
+
+    async def _get_translation(self, translation_id: str, token: str) -> Optional[Dict[str, Any]]:
+        """Fetch the fields a translation delete needs, or None if it doesn't exist."""
+        response = await self._send(
+            "GET", f"{self.base_url}/api/collections/translations/records/{translation_id}",
+            params={"fields": "user,created,source_lang,target_lang"},
+            token=token
         )
-        return response.status_code == 204
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
+    async def save_translation(self, user_id: str, source_text: str, translated_text: str,
+                               source_lang: str, target_lang: str, token: str,
+                               record_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Create a translation and upsert its vocabulary entry in one batch.
+
+        The translation, its vocabulary entry and its stats rollups are
+        written in a single PocketBase transaction, so a failure leaves
+        none of them behind. Returns the created translation record.
+        Callers that may resend a save pass a `record_id` (see
+        `new_record_id`) and check `translation_exists` first.
+
+        The batch runs as superuser: users can't write stats rollups, so
+        their counts only ever change through these server-side batches.
+        `user_id` must be the authenticated caller.
+        """
+        body = {"id": record_id} if record_id else {}
+        results = await self._batch_with_vocabulary_upsert([
+            {
+                "method": "POST",
+                "url": "/api/collections/translations/records",
+                "body": {
+                    **body,
+                    "user": user_id,
+                    "source_text": source_text,
+                    "translated_text": translated_text,
+                    "source_lang": source_lang,
+                    "target_lang": target_lang
+                }
+            },
+            *self._stats_requests(user_id, datetime.now(timezone.utc), source_lang, target_lang, 1)
+        ], user_id, source_text, translated_text, source_lang, target_lang, "")
+        return results[0]["body"]
+
+    @staticmethod
+    def _stats_requests(user_id: str, created: datetime, source_lang: str,
+                        target_lang: str, delta: int) -> List[Dict[str, Any]]:
+        """Batch requests moving a translation's slot and all-time rollups by `delta`."""
+        modifier = "count+" if delta > 0 else "count-"
+        return [
+            stats_upsert_request(user_id, slot, source_lang, target_lang, **{modifier: abs(delta)})
+            for slot in (stats_slot(created), "")
+        ]
 
     # Vocabulary collection methods
     async def create_or_update_vocabulary(self, user_id: str, word: str, translation: str,
                                         source_lang: str, target_lang: str, token: str) -> Dict[str, Any]:
-        """Create or increment existing vocabulary item."""
-        # Check if vocabulary item exists
-        response = await self.client.get(
-            f"{self.base_url}/api/collections/vocabulary/records",
-            params={
-                "filter": f"user.id='{user_id}' && word='{word}' && source_lang='{source_lang}' && target_lang='{target_lang}'"
-            },
-            headers=await self._get_headers(token)
-        )
-        
-        if response.status_code == 200 and response.json()["items"]:
-            # Update existing
-            item = response.json()["items"][0]
-            from datetime import datetime, timezone
-            now_iso = datetime.now(timezone.utc).isoformat()
-            update_response = await self.client.patch(
-                f"{self.base_url}/api/collections/vocabulary/records/{item['id']}",
-                json={
-                    "count": item["count"] + 1,
-                    "last_reviewed": now_iso
-                },
-                headers=await self._get_headers(token)
-            )
-            update_response.raise_for_status()
-            return update_response.json()
-        else:
-            # Create new
-            from datetime import datetime, timezone
-            now_iso = datetime.now(timezone.utc).isoformat()
-            create_response = await self.client.post(
-                f"{self.base_url}/api/collections/vocabulary/records",
-                json={
-                    "user": user_id,
-                    "word": word,
-                    "translation": translation,
-                    "source_lang": source_lang,
-                    "target_lang": target_lang,
-                    "count": 1,
-                    "is_mastered": False,
-                    "first_seen": now_iso,
-                    "last_reviewed": now_iso
-                },
-                headers=await self._get_headers(token)
-            )
-            create_response.raise_for_status()
-            return create_response.json()
+        """Create a vocabulary item or atomically increment its count."""
+        results = await self._batch_with_vocabulary_upsert(
+            [], user_id, word, translation, source_lang, target_lang, token
+        )
+        return results[-1]["body"]
+
+    async def _batch_with_vocabulary_upsert(self, requests: List[Dict[str, Any]], user_id: str,
+                                            word: str, translation: str, source_lang: str,
+                                            target_lang: str, token: str) -> List[Dict[str, Any]]:
+        """
+        Run `requests` plus a vocabulary upsert as one transactional batch.
+
+        The upsert targets the entry's deterministic id and bumps `count`
+        with PocketBase's server-side `count+` modifier, so concurrent saves
+        never read-modify-write. Conflicting batches are retried as a whole
+        by `batch_with_retry`.
+        """
+        now_iso = datetime.now(timezone.utc).isoformat()
+        record_id = vocabulary_record_id(user_id, word, source_lang, target_lang)
+        fields = {
+            "translation": translation,
+            "count+": 1,
+            "last_reviewed": now_iso
+        }
+        # PUT upserts by id; first_seen is stamped by the create hook
+        upsert = {
+            "method": "PUT",
+            "url": "/api/collections/vocabulary/records",
+            "body": {
+                "id": record_id,
+                "user": user_id,
+                "word": word,
+                "source_lang": source_lang,
+                "target_lang": target_lang,
+                **fields
+            }
+        }
 
-    async def get_user_vocabulary(self, user_id: str, token: str, page: int = 1, per_page: int = 50) -> Dict[str, Any]:
-        """Get user's vocabulary."""
-        response = await self.client.get(
-            f"{self.base_url}/api/collections/vocabulary/records",
+        def patch(legacy_id: str) -> Dict[str, Any]:
+            return {
+                "method": "PATCH",
+                "url": f"/api/collections/vocabulary/records/{legacy_id}",
+                "body": fields
+            }
+
+        key = (user_id, word, source_lang, target_lang)
+        legacy_id = self.legacy_vocabulary_ids.get(key)
+        if legacy_id is not None:
+            try:
+                return await self.batch(requests + [patch(legacy_id)], token)
+            except httpx.HTTPStatusError as e:
+                # A 404 or 400 means the legacy row may be gone: upsert by
+                # deterministic id again. Anything else is not about the row.
+                if e.response.status_code not in (400, 404):
+                    raise
+                self.legacy_vocabulary_ids.delete(key)
+
+        async def use_legacy_row(requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            # Rows created before deterministic ids hold the unique key under
+            # a random id; increment that row instead of inserting a new one,
+            # and remember it so later saves skip the failed first attempt
+            existing = await self._find_vocabulary(user_id, word, source_lang, target_lang, token)
+            if existing and existing["id"] != record_id:
+                self.legacy_vocabulary_ids.set(key, existing["id"])
+                requests[-1] = patch(existing["id"])
+            return requests
+
+        return await self.batch_with_retry(requests + [upsert], token, on_conflict=use_legacy_row)
+
+    async def _find_vocabulary(self, user_id: str, word: str, source_lang: str,
+                               target_lang: str, token: str) -> Optional[Dict[str, Any]]:
+        """Look up a vocabulary item by its natural key."""
+        response = await self._send(
+            "GET", f"{self.base_url}/api/collections/vocabulary/records",
             params={
-                "filter": f"user.id='{user_id}'",
-                "sort": "-last_reviewed",
-                "page": page,
-                "perPage": per_page
+                "filter": (
+                    f"user.id={filter_literal(user_id)} && word={filter_literal(word)} && "
+                    f"source_lang={filter_literal(source_lang)} && target_lang={filter_literal(target_lang)}"
+                ),
+                "perPage": 1,
+                "skipTotal": 1
             },
-            headers=await self._get_headers(token)
+            token=token
         )
         response.raise_for_status()
-        return response.json()
+        items = response.json()["items"]
+        return items[0] if items else None
+
+    async def get_user_vocabulary(self, user_id: str, token: str, page: int = 1, per_page: int = 50,
+                                  fields: Optional[List[str]] = None,
+                                  skip_total: bool = False) -> Dict[str, Any]:
+        """Get user's vocabulary. See `get_user_translations` for the options."""
+        return await self._coalesced_get(
+            "vocabulary", token,
+            _list_params(f"user.id={filter_literal(user_id)}", "-last_reviewed", page, per_page,
+                         fields, skip_total)
+        )
 
     async def update_vocabulary_mastered(self, vocab_id: str, is_mastered: bool, token: str) -> Dict[str, Any]:
         """Update vocabulary mastery status."""
-        from datetime import datetime, timezone
         now_iso = datetime.now(timezone.utc).isoformat()
-        response = await self.client.patch(
-            f"{self.base_url}/api/collections/vocabulary/records/{vocab_id}",
+        response = await self._send(
+            "PATCH", f"{self.base_url}/api/collections/vocabulary/records/{vocab_id}",
             json={
                 "is_mastered": is_mastered,
                 "last_reviewed": now_iso
             },
-            headers=await self._get_headers(token)
+            token=token
         )
         response.raise_for_status()
         return response.json()
 
     async def delete_vocabulary(self, vocab_id: str, token: str) -> bool:
         """Delete vocabulary item."""
-        response = await self.client.delete(
-            f"{self.base_url}/api/collections/vocabulary/records/{vocab_id}",
-            headers=await self._get_headers(token)
+        response = await self._send(
+            "DELETE", f"{self.base_url}/api/collections/vocabulary/records/{vocab_id}",
+            token=token
         )
         return response.status_code == 204
 
+    async def get_vocabulary_item(self, vocab_id: str, user_id: str, token: str) -> Optional[Dict[str, Any]]:
+        """Get one of the user's vocabulary items by id, or None."""
+        response = await self._send(
+            "GET", f"{self.base_url}/api/collections/vocabulary/records",
+            params=_list_params(
+                f"id={filter_literal(vocab_id)} && user.id={filter_literal(user_id)}",
+                "", 1, 1, skip_total=True
+            ),
+            token=token
+        )
+        response.raise_for_status()
+        items = response.json()["items"]
+        return items[0] if items else None
+
+    # Generic queries
+    async def list_records(self, collection: str, token: str, filter: str = "", sort: str = "",
+                           page: int = 1, per_page: int = 50, fields: Optional[List[str]] = None,
+                           skip_total: bool = False) -> Dict[str, Any]:
+        """Get one page of records from any collection."""
+        response = await self._send(
+            "GET", f"{self.base_url}/api/collections/{collection}/records",
+            params=_list_params(filter, sort, page, per_page, fields, skip_total),
+            token=token
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def count_records(self, collection: str, token: str, filter: str = "") -> int:
+        """Count matching records with a single minimal page request."""
+        result = await self.list_records(collection, token, filter, per_page=1, fields=["id"])
+        return result["totalItems"]
+
+    async def _coalesced_get(self, collection: str, token: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        List records, sharing the request with identical in-flight reads.
+
+        The result is shared between callers and must not be mutated.
+        """
+        async def fetch() -> Dict[str, Any]:
+            response = await self._send(
+                "GET", f"{self.base_url}/api/collections/{collection}/records",
+                params=params,
+                token=token
+            )
+            response.raise_for_status()
+            return response.json()
+
+        key = (collection, token, tuple(sorted(params.items())))
+        return await self.read_flight.do(key, fetch)
+
+    # Streaming
+    async def iter_records(self, collection: str, token: str, filter: str = "",
+                           sort_field: str = "created", descending: bool = True,
+                           fields: Optional[List[str]] = None, page_size: int = 200,
+                           prefetch: bool = True) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every record of a collection matching `filter`.
+
+        Pages are walked lazily with keyset pagination on (`sort_field`, id)
+        instead of growing offsets, so each page is an indexed range scan
+        and only one or two pages are held in memory. With `prefetch` the
+        next page is requested while the current one is being consumed.
+        """
+        op = "<" if descending else ">"
+        order = "-" if descending else ""
+        if fields:
+            fields = list(dict.fromkeys([*fields, sort_field, "id"]))
+
+        async def fetch_page(after: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            clauses = [f"({filter})"] if filter else []
+            if after is not None:
+                value, record_id = filter_literal(after[sort_field]), filter_literal(after["id"])
+                clauses.append(
+                    f"({sort_field} {op} {value} || ({sort_field} = {value} && id {op} {record_id}))"
+                )
+            response = await self._send(
+                "GET", f"{self.base_url}/api/collections/{collection}/records",
+                params=_list_params(" && ".join(clauses), f"{order}{sort_field},{order}id",
+                                    1, page_size, fields, skip_total=True),
+                token=token
+            )
+            response.raise_for_status()
+            return response.json()["items"]
+
+        next_page = asyncio.ensure_future(fetch_page(None))
+        try:
+            while next_page is not None:
+                items = await next_page
+                next_page = None
+                if len(items) == page_size:
+                    next_page = fetch_page(items[-1])
+                    if prefetch:
+                        next_page = asyncio.ensure_future(next_page)
+                for item in items:
+                    yield item
+        finally:
+            # The consumer stopped early: drop the prefetched page
+            if isinstance(next_page, asyncio.Future):
+                next_page.cancel()
+            elif next_page is not None:
+                next_page.close()
+
+    # Batch API
+    async def batch(self, requests: List[Dict[str, Any]], token: str) -> List[Dict[str, Any]]:
+        """
+        Send several record requests as one transactional /api/batch call.
+
+        Each request is a dict with `method`, `url` and optional `body`.
+        Returns the `{"status", "body"}` results in request order.
+        """
+        response = await self._send(
+            "POST", f"{self.base_url}/api/batch",
+            json={"requests": requests},
+            token=token
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def batch_with_retry(self, requests: List[Dict[str, Any]], token: str,
+                               on_conflict: Optional[Callable[[List[Dict[str, Any]]],
+                                                              Awaitable[List[Dict[str, Any]]]]] = None
+                               ) -> List[Dict[str, Any]]:
+        """
+        Send a batch, retrying with jittered backoff when it loses a race.
+
+        When two transactions race on the same row (or a unique index
+        rejects an insert) PocketBase rolls the whole batch back, so it is
+        safe to resend. Other failures are raised at once. `on_conflict`
+        may rewrite the requests before the next attempt.
+        """
+        max_retries = settings.POCKETBASE_UPSERT_MAX_RETRIES
+        for attempt in range(max_retries + 1):
+            try:
+                return await self.batch(requests, token)
+            except httpx.HTTPStatusError as e:
+                if not is_write_conflict(e.response) or attempt == max_retries:
+                    raise
+            if on_conflict is not None:
+                requests = await on_conflict(requests)
+            backoff = settings.POCKETBASE_UPSERT_RETRY_BACKOFF * (2 ** attempt)
+            await asyncio.sleep(random.uniform(0, backoff))
+
 
 # Global client instance
 pocketbase = PocketBaseClient()
@@ -0,0 +1,154 @@
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Union
+
+
+class Bucket(NamedTuple):
+    name: str
+    capacity: float
+    rate: float  # Tokens refilled per second
+
+
+class PeriodQuota(NamedTuple):
+    """A budget that resets at fixed period boundaries instead of refilling."""
+    name: str
+    limit: float
+
+
+Budget = Union[Bucket, PeriodQuota]
+
+
+class SharedTokenBuckets:
+    """
+    Token buckets and period quotas stored in a local SQLite database.
+
+    Every gunicorn worker on the host opens the same file, so a budget is
+    metered once for the whole host rather than once per process. Each
+    take runs in an IMMEDIATE transaction, which serializes the
+    read-refill-write across processes. Use ":memory:" for a per-process
+    budget. Calls are blocking; async callers should run them in a thread.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(
+                self.path,
+                timeout=self.busy_timeout,
+                isolation_level=None,
+                check_same_thread=False
+            )
+            if self.path != ":memory:":
+                conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quotas ("
+                "name TEXT PRIMARY KEY, period TEXT NOT NULL, used REAL NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _level(bucket: Bucket, row: Optional[tuple], now: float) -> float:
+        if row is None:
+            return bucket.capacity
+        tokens, updated_at = row
+        return min(bucket.capacity, tokens + max(0.0, now - updated_at) * bucket.rate)
+
+    @staticmethod
+    def _used(row: Optional[tuple], period: str) -> float:
+        # Usage recorded in an earlier period no longer counts
+        return row[1] if row is not None and row[0] == period else 0.0
+
+    def take(self, costs: Dict[Budget, float], reserves: Optional[Dict[Budget, float]] = None,
+             period: str = "", resets_in: float = math.inf) -> float:
+        """
+        Take `costs` from every budget at once, or from none of them.
+
+        A budget only pays out while at least its reserve would remain.
+        Period quotas count usage within `period`, which resets in
+        `resets_in` seconds. Returns 0.0 on success, otherwise the seconds
+        until the costs could be met (infinity if they never can).
+        """
+        reserves = reserves or {}
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                levels = {}
+                wait = 0.0
+                for budget, cost in costs.items():
+                    needed = cost + reserves.get(budget, 0.0)
+                    if isinstance(budget, PeriodQuota):
+                        row = conn.execute(
+                            "SELECT period, used FROM quotas WHERE name = ?", (budget.name,)
+                        ).fetchone()
+                        levels[budget] = self._used(row, period)
+                        if needed > budget.limit:
+                            wait = math.inf
+                        elif levels[budget] + needed > budget.limit:
+                            wait = max(wait, resets_in)
+                        continue
+                    row = conn.execute(
+                        "SELECT tokens, updated_at FROM buckets WHERE name = ?", (budget.name,)
+                    ).fetchone()
+                    levels[budget] = self._level(budget, row, now)
+                    if needed > budget.capacity or (needed > levels[budget] and budget.rate <= 0):
+                        wait = math.inf
+                    elif needed > levels[budget]:
+                        wait = max(wait, (needed - levels[budget]) / budget.rate)
+                if wait == 0.0:
+                    for budget, cost in costs.items():
+                        if isinstance(budget, PeriodQuota):
+                            conn.execute(
+                                "INSERT OR REPLACE INTO quotas (name, period, used) VALUES (?, ?, ?)",
+                                (budget.name, period, levels[budget] + cost)
+                            )
+                        else:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                                (budget.name, levels[budget] - cost, now)
+                            )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return wait
+
+    def levels(self, budgets: List[Budget], period: str = "") -> Dict[str, float]:
+        """Return what is left of each budget: tokens, or the quota unused in `period`."""
+        now = time.time()
+        levels = {}
+        with self._lock:
+            conn = self._connect()
+            for budget in budgets:
+                if isinstance(budget, PeriodQuota):
+                    row = conn.execute(
+                        "SELECT period, used FROM quotas WHERE name = ?", (budget.name,)
+                    ).fetchone()
+                    levels[budget.name] = budget.limit - self._used(row, period)
+                else:
+                    levels[budget.name] = self._level(budget, conn.execute(
+                        "SELECT tokens, updated_at FROM buckets WHERE name = ?", (budget.name,)
+                    ).fetchone(), now)
+        return levels
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,12 +1,14 @@
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from contextlib import asynccontextmanager
+import asyncio
 
 from core.config import settings
+from core.security import verify_metrics_access
 from routers import auth, translations, vocabulary, users
 # Notification scheduler disabled for now - uncomment when Firebase is configured
 # from services.notification_scheduler import notification_scheduler
@@ -17,6 +19,14 @@ limiter = Limiter(key_func=get_remote_address)
 
 
 from core.pocketbase_client import pocketbase
+from services.korean_extractor import korean_extractor
+from services.papago import papago
+from services.papago_quota import papago_quota
+from services.persistence import persist_queue
+from services.translation_cache import translation_cache
+from services.translation_memory import translation_memory
+from services.translation_providers import translation_providers
+from services.translator import papago_flight
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -24,10 +34,37 @@ async def lifespan(app: FastAPI):
     # Startup
     # Notification scheduler disabled - uncomment when Firebase credentials are set up
     # await notification_scheduler.start()
+    await papago.start()
+    persist_queue.start()
+    warmup = None
+    if settings.KOREAN_EXTRACTOR_WARMUP:
+        # In the background, so the worker accepts requests while the JVM starts
+        warmup = asyncio.create_task(korean_extractor.warmup_async())
+    await translation_cache.warm()
+
+    async def load_translation_memory():
+        try:
+            await translation_memory.load()
+        except Exception as e:
+            # Serve without the memory rather than refusing to start
+            print(f"Failed to load translation memory: {e}")
+
+    # In the background; the memory misses until its index is built
+    memory_load = asyncio.create_task(load_translation_memory())
 
     yield
 
     # Shutdown
+    if warmup is not None and not warmup.done():
+        warmup.cancel()
+    if not memory_load.done():
+        memory_load.cancel()
+    # Finish queued saves while PocketBase is still reachable
+    await persist_queue.drain(settings.PERSIST_QUEUE_DRAIN_TIMEOUT)
+    await papago.close()
+    translation_cache.close()
+    papago_quota.close()
+    korean_extractor.close()
     await pocketbase.close()
     # await notification_scheduler.stop()
 
@@ -84,6 +121,26 @@ async def health_check(request: Request):
     }
 
 
+def _collect_metrics() -> dict:
+    # Blocking: several counters are read from the shared SQLite files
+    return {
+        "translation_cache": translation_cache.stats(),
+        "translation_providers": translation_providers.stats(),
+        "papago_quota": papago_quota.stats(),
+        "translation_memory": translation_memory.stats(),
+        "persist_queue": persist_queue.stats(),
+        "korean_extractor": korean_extractor.stats(),
+        "papago_singleflight": papago_flight.stats(),
+        "pocketbase_singleflight": pocketbase.read_flight.stats()
+    }
+
+
+@app.get("/metrics", dependencies=[Depends(verify_metrics_access)])
+async def metrics():
+    """Internal counters of this worker's caches and outbound clients."""
+    return await asyncio.to_thread(_collect_metrics)
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler."""
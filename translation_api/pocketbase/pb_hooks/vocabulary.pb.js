@@ -0,0 +1,9 @@
+/// <reference path="../pb_data/types.d.ts" />
+
+// Vocabulary upserts don't send first_seen; stamp it when the row is created
+onRecordCreate((e) => {
+  if (!e.record.getString("first_seen")) {
+    e.record.set("first_seen", new Date().toISOString())
+  }
+  e.next()
+}, "vocabulary")
@@ -0,0 +1,54 @@
+/// <reference path="../pb_data/types.d.ts" />
+migrate((app) => {
+  const collection = app.findCollectionByNameOrId("pbc_1848244715")
+
+  // The API reads and writes `word` and `last_reviewed`
+  const words = collection.fields.getByName("words")
+  if (words) {
+    words.name = "word"
+  }
+  const lastSeen = collection.fields.getByName("last_seen")
+  if (lastSeen) {
+    lastSeen.name = "last_reviewed"
+  }
+  app.save(collection)
+
+  // Merge duplicate rows left by the old read-then-write upsert so the
+  // unique index can be created; counts are summed into the oldest row
+  const keep = {}
+  const records = app.findRecordsByFilter("vocabulary", "", "created", 0, 0)
+  for (const record of records) {
+    const key = [
+      record.getString("user"),
+      record.getString("word"),
+      record.getString("source_lang"),
+      record.getString("target_lang"),
+    ].join("\u001f")
+
+    const first = keep[key]
+    if (!first) {
+      keep[key] = record
+      continue
+    }
+    first.set("count", first.getFloat("count") + record.getFloat("count"))
+    if (record.getString("last_reviewed") > first.getString("last_reviewed")) {
+      first.set("last_reviewed", record.getString("last_reviewed"))
+    }
+    app.save(first)
+    app.delete(record)
+  }
+
+  collection.indexes.push(
+    "CREATE UNIQUE INDEX `idx_vocabulary_user_word_langs` ON `vocabulary` (`user`, `word`, `source_lang`, `target_lang`)"
+  )
+
+  return app.save(collection)
+}, (app) => {
+  const collection = app.findCollectionByNameOrId("pbc_1848244715")
+
+  collection.indexes = collection.indexes.filter(
+    (index) => !index.includes("idx_vocabulary_user_word_langs")
+  )
+
+  return app.save(collection)
+})
@@ -0,0 +1,21 @@
+/// <reference path="../pb_data/types.d.ts" />
+migrate((app) => {
+  const collection = app.findCollectionByNameOrId("pbc_2435817089")
+
+  // The API reads and writes the owner of a translation as `user`
+  const relation = collection.fields.getByName("relation")
+  if (relation) {
+    relation.name = "user"
+  }
+
+  return app.save(collection)
+}, (app) => {
+  const collection = app.findCollectionByNameOrId("pbc_2435817089")
+
+  const user = collection.fields.getByName("user")
+  if (user) {
+    user.name = "relation"
+  }
+
+  return app.save(collection)
+})
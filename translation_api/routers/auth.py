@@ -1,3 +1,4 @@
+import hashlib
 from datetime import timedelta
 from typing import Any
 
@@ -7,6 +8,7 @@ from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from core.cache import TTLCache
 from core.config import settings
 from core.pocketbase_client import pocketbase
 from core.security import create_access_token, verify_password
@@ -16,13 +18,32 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
+# User records keyed by (user_id, PocketBase token hash)
+user_cache = TTLCache(
+    max_size=settings.AUTH_USER_CACHE_MAX_SIZE,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS
+)
+
+
+def _user_cache_key(user_id: str, pb_token: str) -> tuple[str, str]:
+    return user_id, hashlib.sha256(pb_token.encode()).hexdigest()
+
+
+def invalidate_cached_user(user_id: str) -> None:
+    """Drop every cached record of a user, e.g. after a profile change."""
+    user_cache.delete_matching(lambda key: key[0] == user_id)
+
+
+def invalidate_cached_token(user_id: str, pb_token: str) -> None:
+    """Drop the cached record for a single session token."""
+    user_cache.delete(_user_cache_key(user_id, pb_token))
+
 
 @router.post("/register", response_model=Token)
 async def register(user_data: UserCreate) -> Any:
     """Register a new user."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             # 1. Create the user
             user = await pocketbase.create_user(
                 email=user_data.email,
@@ -115,11 +136,21 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
     except JWTError:
         raise credentials_exception
 
+    # The JWT signature and expiry are verified above, so a recently
+    # fetched record for this session can be reused without PocketBase
+    cache_key = _user_cache_key(user_id, pb_token)
+    if settings.AUTH_TRUST_LOCAL_JWT:
+        cached = user_cache.get(cache_key)
+        if cached is not None:
+            return {**cached, "token": pb_token}
+
     try:
         async with pocketbase:
             # We use the user's token to get their profile
             # This ensures we respect PocketBase's RLS rules
             user = await pocketbase.get_user(user_id, pb_token)
+            if settings.AUTH_TRUST_LOCAL_JWT:
+                user_cache.set(cache_key, dict(user))
             
             # Inject the token into the user object so routers can use it
             user["token"] = pb_token
@@ -1,16 +1,38 @@
-from typing import Any, List
-from datetime import datetime
+import asyncio
+import json
+from typing import Any, List, Optional
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 
-from core.pocketbase_client import pocketbase
+from core.pocketbase_client import filter_datetime, filter_literal, pocketbase
 from routers.auth import get_current_user
-from schemas.translation import TranslationCreate, TranslationResponse, TranslationStats, TranslationRequest
-import httpx
+from schemas.translation import (
+    BatchTranslationItem,
+    BatchTranslationRequest,
+    BatchTranslationResponse,
+    TranslationCreate,
+    TranslationRequest,
+    TranslationResponse,
+    TranslationStats,
+)
+from services import translator
+from services.persistence import save_translation, save_translation_later
+from services.papago import PapagoError
+from services.papago_quota import QuotaExceededError
+from services.translation_providers import ProviderError
+from services.stats_rollup import get_translation_stats
 from core.config import settings
 
 router = APIRouter(prefix="/translations", tags=["translations"])
 
+# Minimal record shape needed by the summary endpoints
+SUMMARY_VOCABULARY_FIELDS = ["word", "count", "translation", "last_reviewed"]
+SUMMARY_TOP_WORDS = 10
+SUMMARY_MAX_HOURS = 24 * 366
+
 
 @router.post("/", response_model=TranslationResponse)
 async def create_translation(
@@ -20,8 +42,8 @@ async def create_translation(
     """Create a new translation."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
-            result = await pocketbase.create_translation(
+            # Translation insert and vocabulary upsert in one transaction
+            result = await save_translation(
                 user_id=current_user["id"],
                 source_text=translation.source_text,
                 translated_text=translation.translated_text,
@@ -29,17 +51,7 @@ async def create_translation(
                 target_lang=translation.target_lang,
                 token=current_user.get("token", "")
             )
-            
-            # Also create/update vocabulary
-            await pocketbase.create_or_update_vocabulary(
-                user_id=current_user["id"],
-                word=translation.source_text,
-                translation=translation.translated_text,
-                source_lang=translation.source_lang,
-                target_lang=translation.target_lang,
-                token=current_user.get("token", "")
-            )
-            
+
             return TranslationResponse(**result)
     except Exception as e:
         raise HTTPException(
@@ -54,39 +66,127 @@ async def proxy_translation(
     request: TranslationRequest,
     current_user: dict = Depends(get_current_user)
 ) -> Any:
-    """Proxy translation request to Papago API."""
+    """
+    Proxy translation request to Papago API.
+
+    Texts missing from the translation cache but close enough to an
+    earlier translation are answered from the translation memory;
+    `matchScore` is then the similarity of the match.
+    With `save`, the translation is also saved in the background, as
+    `POST /translations/` would, without delaying the response.
+    """
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                "https://openapi.naver.com/v1/papago/n2mt",
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                    "X-Naver-Client-Id": settings.PAPAGO_CLIENT_ID,
-                    "X-Naver-Client-Secret": settings.PAPAGO_CLIENT_SECRET,
-                },
-                data={
-                    "source": request.source_lang,
-                    "target": request.target_lang,
-                    "text": request.text
-                }
-            )
-            
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=f"Papago API error: {response.text}"
-                )
-                
-            data = response.json()
-            return {
-                "translatedText": data["message"]["result"]["translatedText"]
-            }
+        translated, score = await translator.translate_with_memory(
+            request.text,
+            request.source_lang,
+            request.target_lang
+        )
+    except (PapagoError, ProviderError, QuotaExceededError) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Translation proxy failed: {str(e)}"
         )
 
+    if request.save:
+        await save_translation_later(
+            current_user["id"],
+            request.text,
+            translated,
+            request.source_lang,
+            request.target_lang,
+            current_user.get("token", "")
+        )
+    return {"translatedText": translated, "matchScore": score}
+
+
+@router.post("/proxy/batch", response_model=BatchTranslationResponse)
+async def proxy_translation_batch(
+    request: BatchTranslationRequest,
+    current_user: dict = Depends(get_current_user)
+) -> Any:
+    """
+    Translate many texts in one call.
+
+    Results come back in request order; a text that fails carries an
+    `error` instead of `translatedText`.
+    """
+    if len(request.texts) > settings.TRANSLATION_BATCH_MAX_TEXTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.TRANSLATION_BATCH_MAX_TEXTS} texts per batch"
+        )
+    try:
+        results = await translator.translate_many(
+            request.texts,
+            request.source_lang,
+            request.target_lang
+        )
+        return BatchTranslationResponse(results=[
+            BatchTranslationItem(error=str(result)) if isinstance(result, Exception)
+            else BatchTranslationItem(translatedText=result)
+            for result in results
+        ])
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Batch translation failed: {str(e)}"
+        )
+
+
+@router.post("/proxy/stream")
+async def proxy_translation_stream(
+    request: TranslationRequest,
+    http_request: Request,
+    current_user: dict = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Translate a long text sentence by sentence, streaming results in order.
+
+    Each event carries `index`, `text`, `separator` (the whitespace that
+    followed the sentence) and `translatedText` or `error`. Responds with
+    Server-Sent Events when the client accepts `text/event-stream`,
+    otherwise with NDJSON. With `save`, the joined translation is saved in
+    the background once every sentence is translated, as on `/proxy`.
+    """
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+
+    async def events():
+        parts: List[str] = []
+        failed = False
+        async for index, segment, result in translator.translate_stream(
+            request.text,
+            request.source_lang,
+            request.target_lang,
+            window=settings.TRANSLATION_STREAM_WINDOW
+        ):
+            event = {"index": index, "text": segment.text, "separator": segment.separator}
+            if isinstance(result, Exception):
+                event["error"] = str(result)
+                failed = True
+            else:
+                event["translatedText"] = result
+                parts.append(result + segment.separator)
+            line = json.dumps(event, ensure_ascii=False)
+            yield f"data: {line}\n\n" if sse else f"{line}\n"
+
+        # A partial translation is not worth saving
+        if request.save and parts and not failed:
+            await save_translation_later(
+                current_user["id"],
+                request.text,
+                "".join(parts).rstrip(),
+                request.source_lang,
+                request.target_lang,
+                current_user.get("token", "")
+            )
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if sse else "application/x-ndjson"
+    )
+
 
 @router.get("/", response_model=List[TranslationResponse])
 async def get_translations(
@@ -97,12 +197,12 @@ async def get_translations(
     """Get user's translations."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             result = await pocketbase.get_user_translations(
                 current_user["id"], 
                 current_user.get("token", ""),
                 page, 
-                per_page
+                per_page,
+                skip_total=True
             )
             return [TranslationResponse(**item) for item in result["items"]]
     except Exception as e:
@@ -120,7 +220,6 @@ async def delete_translation(
     """Delete a translation."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             success = await pocketbase.delete_translation(
                 translation_id, 
                 current_user.get("token", "")
@@ -137,64 +236,105 @@ async def delete_translation(
         )
 
 
-@router.get("/daily-summary")
-async def get_daily_summary(current_user: dict = Depends(get_current_user)) -> dict:
-    """Get daily translation summary with vocabulary stats (last 24 hours)."""
+@router.get("/stats", response_model=TranslationStats)
+async def get_stats(
+    current_user: dict = Depends(get_current_user),
+    tz: str = settings.STATS_DEFAULT_TIMEZONE
+) -> Any:
+    """Get translation counts; "today" and "this week" follow timezone `tz`."""
+    try:
+        zone = ZoneInfo(tz)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown timezone: {tz}"
+        )
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
-
-            # Get translations from today
-            translations = await pocketbase.get_user_translations(
+            return await get_translation_stats(
                 current_user["id"],
                 current_user.get("token", ""),
-                page=1,
-                per_page=1000
+                zone
             )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to get translation stats: {str(e)}"
+        )
 
-            # Get vocabulary
-            vocabulary = await pocketbase.get_user_vocabulary(
-                current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
-            )
 
-            # Filter for last 24 hours
-            now = datetime.now()
-            yesterday = now - timedelta(hours=24)
-
-            recent_translations = [
-                t for t in translations["items"]
-                if datetime.fromisoformat(t["created"][:-1]) > yesterday
-            ]
-
-            recent_vocabulary = [
-                v for v in vocabulary["items"]
-                if datetime.fromisoformat(v["last_reviewed"][:-1]) > yesterday
-            ]
-
-            # Calculate stats
-            total_translations = len(recent_translations)
-            unique_words = len(recent_vocabulary)
-            most_frequent = sorted(
-                recent_vocabulary,
-                key=lambda x: x["count"],
-                reverse=True
-            )[:10]
-
-            return {
-                "total_translations": total_translations,
-                "unique_words": unique_words,
-                "most_frequent_words": [
-                    {
-                        "word": item["word"],
-                        "count": item["count"],
-                        "translation": item["translation"]
-                    }
-                    for item in most_frequent
-                ]
+async def _summarize(current_user: dict, since: datetime) -> dict:
+    """
+    Summarize a user's translations and vocabulary since `since`.
+
+    The time window is pushed into the PocketBase filters, so each side is
+    a single small query whose cost scales with the window: a COUNT over
+    the window's translations, and the top words in the window (its
+    `totalItems` gives the unique word count). Both run concurrently.
+    """
+    token = current_user.get("token", "")
+    user_filter = f"user.id={filter_literal(current_user['id'])}"
+
+    total_translations, vocabulary = await asyncio.gather(
+        pocketbase.count_records(
+            "translations", token,
+            f"{user_filter} && created >= {filter_datetime(since)}"
+        ),
+        pocketbase.list_records(
+            "vocabulary", token,
+            f"{user_filter} && last_reviewed >= {filter_datetime(since)}",
+            sort="-count,-last_reviewed",
+            per_page=SUMMARY_TOP_WORDS,
+            fields=SUMMARY_VOCABULARY_FIELDS
+        )
+    )
+
+    return {
+        "total_translations": total_translations,
+        "unique_words": vocabulary["totalItems"],
+        "most_frequent_words": [
+            {
+                "word": item["word"],
+                "count": item["count"],
+                "translation": item["translation"]
             }
+            for item in vocabulary["items"]
+        ]
+    }
+
+
+@router.get("/summary")
+async def get_summary(
+    current_user: dict = Depends(get_current_user),
+    hours: int = Query(24, ge=1, le=SUMMARY_MAX_HOURS),
+    since: Optional[datetime] = None
+) -> dict:
+    """
+    Get translation summary with vocabulary stats for any time window.
+
+    The window is the last `hours` hours, or starts at `since` if given.
+    """
+    try:
+        if since is None:
+            since = datetime.now(timezone.utc) - timedelta(hours=hours)
+        elif since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        async with pocketbase:
+            return await _summarize(current_user, since)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to get summary: {str(e)}"
+        )
+
+
+@router.get("/daily-summary")
+async def get_daily_summary(current_user: dict = Depends(get_current_user)) -> dict:
+    """Get daily translation summary with vocabulary stats (last 24 hours)."""
+    try:
+        async with pocketbase:
+            since = datetime.now(timezone.utc) - timedelta(hours=24)
+            return await _summarize(current_user, since)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -207,59 +347,8 @@ async def get_two_day_summary(current_user: dict = Depends(get_current_user)) ->
     """Get 2-day translation summary with vocabulary stats (last 48 hours)."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
-
-            # Get translations from last 2 days
-            translations = await pocketbase.get_user_translations(
-                current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
-            )
-
-            # Get vocabulary
-            vocabulary = await pocketbase.get_user_vocabulary(
-                current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
-            )
-
-            # Filter for last 48 hours
-            now = datetime.now()
-            two_days_ago = now - timedelta(hours=48)
-
-            recent_translations = [
-                t for t in translations["items"]
-                if datetime.fromisoformat(t["created"][:-1]) > two_days_ago
-            ]
-
-            recent_vocabulary = [
-                v for v in vocabulary["items"]
-                if datetime.fromisoformat(v["last_reviewed"][:-1]) > two_days_ago
-            ]
-
-            # Calculate stats
-            total_translations = len(recent_translations)
-            unique_words = len(recent_vocabulary)
-            most_frequent = sorted(
-                recent_vocabulary,
-                key=lambda x: x["count"],
-                reverse=True
-            )[:10]
-
-            return {
-                "total_translations": total_translations,
-                "unique_words": unique_words,
-                "most_frequent_words": [
-                    {
-                        "word": item["word"],
-                        "count": item["count"],
-                        "translation": item["translation"]
-                    }
-                    for item in most_frequent
-                ]
-            }
+            since = datetime.now(timezone.utc) - timedelta(hours=48)
+            return await _summarize(current_user, since)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -269,48 +358,11 @@ async def get_two_day_summary(current_user: dict = Depends(get_current_user)) ->
 
 @router.get("/weekly-summary")
 async def get_weekly_summary(current_user: dict = Depends(get_current_user)) -> dict:
-    """Get weekly translation summary with vocabulary stats."""
+    """Get weekly translation summary with vocabulary stats (last 7 days)."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
-
-            # Get translations from this week
-            translations = await pocketbase.get_user_translations(
-                current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
-            )
-
-            # Get vocabulary
-            vocabulary = await pocketbase.get_user_vocabulary(
-                current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
-            )
-
-            # Calculate stats
-            total_translations = len(translations["items"])
-            unique_words = len(vocabulary["items"])
-            most_frequent = sorted(
-                vocabulary["items"],
-                key=lambda x: x["count"],
-                reverse=True
-            )[:10]
-
-            return {
-                "total_translations": total_translations,
-                "unique_words": unique_words,
-                "most_frequent_words": [
-                    {
-                        "word": item["word"],
-                        "count": item["count"],
-                        "translation": item["translation"]
-                    }
-                    for item in most_frequent
-                ]
-            }
+            since = datetime.now(timezone.utc) - timedelta(days=7)
+            return await _summarize(current_user, since)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
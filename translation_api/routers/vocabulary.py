@@ -16,12 +16,12 @@ async def get_vocabulary(
     """Get user's vocabulary list."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             result = await pocketbase.get_user_vocabulary(
                 current_user["id"],
                 current_user.get("token", ""),
                 page,
-                per_page
+                per_page,
+                skip_total=True
             )
             return result["items"]
     except Exception as e:
@@ -39,21 +39,14 @@ async def get_vocabulary_item(
     """Get a specific vocabulary item."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
-            # Get vocabulary by filtering for the specific ID
-            result = await pocketbase.get_user_vocabulary(
+            item = await pocketbase.get_vocabulary_item(
+                vocabulary_id,
                 current_user["id"],
-                current_user.get("token", ""),
-                page=1,
-                per_page=1000
+                current_user.get("token", "")
             )
-
-            # Find the specific item
-            for item in result["items"]:
-                if item["id"] == vocabulary_id:
-                    return item
-
-            raise HTTPException(status_code=404, detail="Vocabulary item not found")
+            if item is None:
+                raise HTTPException(status_code=404, detail="Vocabulary item not found")
+            return item
 
     except HTTPException:
         raise
@@ -73,7 +66,6 @@ async def update_vocabulary_item(
     """Update vocabulary mastery status."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             result = await pocketbase.update_vocabulary_mastered(
                 vocabulary_id,
                 is_mastered,
@@ -95,7 +87,6 @@ async def delete_vocabulary_item(
     """Delete a vocabulary item."""
     try:
         async with pocketbase:
-            await pocketbase.authenticate_admin()
             success = await pocketbase.delete_vocabulary(
                 vocabulary_id,
                 current_user.get("token", "")
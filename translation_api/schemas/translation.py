@@ -1,6 +1,6 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 
 class TranslationBase(BaseModel):
@@ -18,6 +18,22 @@ class TranslationRequest(BaseModel):
     text: str
     source_lang: str
     target_lang: str
+    save: bool = False  # Also save the translation in the background
+
+
+class BatchTranslationRequest(BaseModel):
+    texts: List[str]
+    source_lang: str
+    target_lang: str
+
+
+class BatchTranslationItem(BaseModel):
+    translatedText: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BatchTranslationResponse(BaseModel):
+    results: List[BatchTranslationItem]
 
 
 class TranslationResponse(TranslationBase):
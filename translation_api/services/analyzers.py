@@ -0,0 +1,124 @@
+"""
+Morphological analyzer backends for Korean word extraction.
+Every backend returns `(lemma, tag)` pairs with verbs and adjectives in
+their -다 dictionary form and tags normalized to Okt's Noun / Verb /
+Adjective (other tags pass through), so the extractor and the POS cache
+don't depend on the analyzer. Selected by KOREAN_ANALYZER_BACKEND.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Type
+
+from services import hangul_tokenizer
+
+try:
+    from konlpy.tag import Okt
+    KONLPY_AVAILABLE = True
+except ImportError:
+    KONLPY_AVAILABLE = False
+    print("Warning: KoNLPy not available. Using fallback word extraction.")
+
+try:
+    from kiwipiepy import Kiwi
+    KIWI_AVAILABLE = True
+except ImportError:
+    KIWI_AVAILABLE = False
+
+# Exercises the dictionaries and the analysis paths analyzers compile lazily
+WARMUP_SENTENCE = "저는 어제 친구와 함께 학교 도서관에서 한국어를 열심히 공부했어요."
+
+PosTags = List[Tuple[str, str]]
+
+
+def _attach_thread_to_jvm() -> None:
+    """Attach the calling thread to the JVM, which Okt needs outside the main thread."""
+    try:
+        import jpype
+    except ImportError:
+        return
+    if jpype.isJVMStarted() and not jpype.isThreadAttachedToJVM():
+        jpype.attachThreadToJVM()
+
+
+class AnalyzerBackend(ABC):
+    name = "analyzer"
+    available = False  # Whether the backend's package is installed
+
+    @abstractmethod
+    def pos(self, text: str) -> PosTags:
+        """Return `(lemma, tag)` pairs for `text`."""
+
+    def pos_batch(self, texts: List[str]) -> List[PosTags]:
+        """Analyze several texts; backends with a batch API override this."""
+        return [self.pos(text) for text in texts]
+
+    def warmup(self) -> None:
+        """Load dictionaries and run a representative sentence."""
+        self.pos(WARMUP_SENTENCE)
+
+
+class OktBackend(AnalyzerBackend):
+    """KoNLPy's Okt; starts a JVM in the process."""
+    name = "okt"
+    available = KONLPY_AVAILABLE
+
+    def __init__(self):
+        self.okt = Okt()
+
+    def pos(self, text: str) -> PosTags:
+        _attach_thread_to_jvm()
+        return self.okt.pos(text, stem=True)
+
+
+# Kiwi (Sejong) tags, without the -R/-I regular/irregular suffix
+_KIWI_TAGS = {"NNG": "Noun", "NNP": "Noun", "VV": "Verb", "VA": "Adjective"}
+
+
+class KiwiBackend(AnalyzerBackend):
+    """kiwipiepy's Kiwi: native code, no JVM."""
+    name = "kiwi"
+    available = KIWI_AVAILABLE
+
+    def __init__(self):
+        self.kiwi = Kiwi()
+
+    def pos(self, text: str) -> PosTags:
+        return self._convert(self.kiwi.tokenize(text))
+
+    def pos_batch(self, texts: List[str]) -> List[PosTags]:
+        # Kiwi analyzes an iterable of texts on its own thread pool
+        return [self._convert(tokens) for tokens in self.kiwi.tokenize(texts)]
+
+    def _convert(self, tokens) -> PosTags:
+        tags = []
+        for token in tokens:
+            tag = _KIWI_TAGS.get(token.tag.split("-")[0], token.tag)
+            # Kiwi returns predicate stems without the -다 ending
+            tags.append((token.form + "다" if tag in ("Verb", "Adjective") else token.form, tag))
+        return tags
+
+
+class HangulBackend(AnalyzerBackend):
+    """
+    The pure-Python fallback tokenizer. It can't tell verbs from
+    adjectives, so both are tagged "Predicate".
+    """
+    name = "hangul"
+    available = True
+
+    def pos(self, text: str) -> PosTags:
+        return hangul_tokenizer.pos(text)
+
+
+BACKENDS: Dict[str, Type[AnalyzerBackend]] = {
+    backend.name: backend for backend in (OktBackend, KiwiBackend, HangulBackend)
+}
+
+
+def create_backend(name: str) -> AnalyzerBackend:
+    """Instantiate the backend called `name`."""
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown analyzer backend: {name}")
+    if not backend.available:
+        raise RuntimeError(f"Analyzer backend {name} is not installed")
+    return backend()
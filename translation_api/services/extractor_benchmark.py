@@ -0,0 +1,190 @@
+"""
+Benchmark of the Korean word extraction backends.
+
+For each installed analyzer backend (Okt, Kiwi, the pure-Python Hangul
+tokenizer) and the legacy regex extractor, reports on the fixture corpus:
+- precision/recall/F1 against the hand-annotated expected words
+- sentences/sec after warmup
+- memory of a worker: peak RSS of a fresh process running the backend,
+  and how much of it the backend added
+- agreement with a reference backend on extracted nouns, verbs and
+  adjectives (Jaccard over all sentences)
+
+Each backend runs in its own spawned process so memory figures don't mix.
+
+Usage:
+    python -m services.extractor_benchmark [--corpus PATH] [--rounds N] [--reference NAME]
+"""
+import argparse
+import multiprocessing
+import os
+import re
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from services import hangul_tokenizer
+from services.analyzers import BACKENDS, AnalyzerBackend, PosTags, create_backend
+
+DEFAULT_CORPUS = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "tests", "fixtures", "korean_corpus.tsv"
+)
+
+Extract = Callable[[str, int], List[str]]
+_LEGACY_PATTERN = re.compile(r'[가-힣]+')
+
+# Tag sets compared for agreement; "Predicate" is a verb or an adjective
+# from a backend that doesn't tell them apart
+CATEGORIES = {
+    "nouns": {"Noun"},
+    "verbs": {"Verb"},
+    "adjectives": {"Adjective"},
+    "predicates": {"Verb", "Adjective", "Predicate"},
+}
+_VOCABULARY_TAGS = {"Noun", "Verb", "Adjective", "Predicate"}
+
+
+def load_corpus(path: str = DEFAULT_CORPUS) -> List[Tuple[str, Set[str]]]:
+    """Read `sentence<TAB>word<TAB>word...` lines, skipping comments."""
+    corpus = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if line and not line.startswith("#"):
+                sentence, *words = line.split("\t")
+                corpus.append((sentence, set(words)))
+    return corpus
+
+
+def legacy_regex_extract(text: str, min_length: int = 2) -> List[str]:
+    """The extractor's original fallback: Hangul runs with particles attached."""
+    return list({
+        word for word in _LEGACY_PATTERN.findall(text)
+        if len(word) >= min_length and word not in hangul_tokenizer.STOPWORDS
+    })
+
+
+def backend_extract(backend: AnalyzerBackend) -> Extract:
+    """Word extraction as KoreanExtractor does it, straight from the backend."""
+    def extract(text: str, min_length: int = 2) -> List[str]:
+        return list({
+            word for word, tag in backend.pos(text)
+            if tag in _VOCABULARY_TAGS and len(word) >= min_length
+            and word not in hangul_tokenizer.STOPWORDS
+        })
+    return extract
+
+
+def evaluate(extract: Extract, corpus: List[Tuple[str, Set[str]]],
+             rounds: int = 20) -> Dict[str, float]:
+    """Micro-averaged precision/recall/F1 on `corpus` and sentences/sec."""
+    true_positives = predicted = expected = 0
+    for sentence, gold in corpus:
+        words = set(extract(sentence, 2))
+        true_positives += len(words & gold)
+        predicted += len(words)
+        expected += len(gold)
+    precision = true_positives / predicted if predicted else 0.0
+    recall = true_positives / expected if expected else 0.0
+
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for sentence, _ in corpus:
+            extract(sentence, 2)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "precision": precision,
+        "recall": recall,
+        "f1": 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+        "sentences_per_second": rounds * len(corpus) / elapsed if elapsed else float("inf"),
+    }
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_backend(name: str, corpus_path: str, rounds: int) -> Tuple[Dict[str, float], List[PosTags]]:
+    """Evaluate one backend; meant to run in a fresh process. Also returns its tags."""
+    corpus = load_corpus(corpus_path)
+    baseline = _peak_rss_mb()
+    backend = create_backend(name)
+    backend.warmup()
+    result = evaluate(backend_extract(backend), corpus, rounds)
+    tags = [backend.pos(sentence) for sentence, _ in corpus]
+    result["rss_mb"] = _peak_rss_mb()
+    result["backend_mb"] = result["rss_mb"] - baseline
+    return result, tags
+
+
+def agreement(tags: List[PosTags], reference: List[PosTags]) -> Dict[str, Optional[float]]:
+    """
+    Jaccard agreement per category between two backends' tags of the
+    same sentences. Verbs and adjectives are None when either backend
+    only tags predicates.
+    """
+    def words(sentence_tags: PosTags, allowed: Set[str]) -> Set[str]:
+        return {word for word, tag in sentence_tags if tag in allowed and len(word) >= 2}
+
+    tags_only_predicates = any(tag == "Predicate" for sentence in tags + reference for _, tag in sentence)
+    result: Dict[str, Optional[float]] = {}
+    for category, allowed in CATEGORIES.items():
+        if category in ("verbs", "adjectives") and tags_only_predicates:
+            result[category] = None
+            continue
+        shared = union = 0
+        for ours, theirs in zip(tags, reference):
+            ours, theirs = words(ours, allowed), words(theirs, allowed)
+            shared += len(ours & theirs)
+            union += len(ours | theirs)
+        result[category] = shared / union if union else 1.0
+    return result
+
+
+def compare(corpus_path: str = DEFAULT_CORPUS, rounds: int = 20,
+            reference: Optional[str] = None) -> Dict[str, Dict[str, Optional[float]]]:
+    """Benchmark every installed backend, plus the legacy regex extractor."""
+    names = [name for name, backend in BACKENDS.items() if backend.available]
+    if reference is None:
+        reference = next(name for name in ("okt", "kiwi", "hangul") if name in names)
+
+    results: Dict[str, Dict[str, Optional[float]]] = {}
+    tags: Dict[str, List[PosTags]] = {}
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name], tags[name] = pool.submit(measure_backend, name, corpus_path, rounds).result()
+    for name in names:
+        results[name].update(agreement(tags[name], tags[reference]))
+
+    results["legacy_regex"] = evaluate(legacy_regex_extract, load_corpus(corpus_path), rounds)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Korean word extraction backends")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--reference", help="Backend to measure agreement against (default: okt, kiwi, hangul)")
+    args = parser.parse_args()
+
+    columns = [
+        ("f1", "f1", ".3f"), ("sentences_per_second", "sent/s", ".0f"),
+        ("rss_mb", "rss MB", ".0f"), ("backend_mb", "+MB", ".0f"),
+        ("nouns", "nouns", ".3f"), ("verbs", "verbs", ".3f"),
+        ("adjectives", "adj", ".3f"), ("predicates", "pred", ".3f"),
+    ]
+    print(f"{'backend':<14}" + "".join(f"{label:>10}" for _, label, _ in columns))
+    for name, result in compare(args.corpus, args.rounds, args.reference).items():
+        print(f"{name:<14}" + "".join(
+            f"{'-' if result.get(key) is None else format(result[key], spec):>10}"
+            for key, _, spec in columns
+        ))
+
+
+if __name__ == "__main__":
+    main()
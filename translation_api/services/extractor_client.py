@@ -0,0 +1,125 @@
+"""
+Client for the Korean extractor sidecar.
+API workers send texts over the sidecar's Unix socket on one persistent
+connection, several requests in flight at once, instead of starting an
+analyzer of their own. When the sidecar is down or too slow, the
+JVM-free fallback answers. See services/extractor_sidecar.py.
+"""
+import asyncio
+import itertools
+import json
+import time
+from typing import Dict, List, Optional
+
+from services import hangul_tokenizer
+
+# Longest protocol line; Papago texts are at most 5000 characters
+MAX_LINE = 1024 * 1024
+
+
+class SidecarError(Exception):
+    """The sidecar answered a request with an error."""
+
+
+class ExtractorClient:
+    def __init__(self, path: str, timeout: float, retry_after: float = 5.0):
+        self.path = path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._retry_at = 0.0
+        self.requests = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.fallbacks = 0
+
+    async def extract_words(self, text: str, min_length: int = 2) -> List[str]:
+        """Extract words in the sidecar, or with the fallback if it can't answer in time."""
+        self.requests += 1
+        try:
+            return await asyncio.wait_for(self._request(text, min_length), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+        except (OSError, SidecarError):
+            self.errors += 1
+        self.fallbacks += 1
+        return hangul_tokenizer.extract_words(text, min_length)
+
+    async def _request(self, text: str, min_length: int) -> List[str]:
+        writer = await self._connect()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer.write(json.dumps(
+                {"id": request_id, "text": text, "min_length": min_length}, ensure_ascii=False
+            ).encode("utf-8") + b"\n")
+            await writer.drain()
+            return await future
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _connect(self) -> asyncio.StreamWriter:
+        if self._writer is not None:
+            return self._writer
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError("Extractor sidecar unavailable")
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None:
+                try:
+                    reader, writer = await asyncio.open_unix_connection(self.path, limit=MAX_LINE)
+                except OSError:
+                    # Don't make every request pay for a connect while the sidecar is down
+                    self._retry_at = time.monotonic() + self.retry_after
+                    raise
+                self._writer = writer
+                self._reader_task = asyncio.create_task(self._read_responses(reader, writer))
+        return self._writer
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while line := await reader.readline():
+                response = json.loads(line)
+                future = self._pending.get(response.get("id"))
+                if future is None or future.done():
+                    continue  # Timed out already
+                if "error" in response:
+                    future.set_exception(SidecarError(response["error"]))
+                else:
+                    future.set_result(response["words"])
+        except (OSError, ValueError):
+            pass
+        finally:
+            # Connection lost: fail the requests in flight so they fall back now
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+                self._retry_at = time.monotonic() + self.retry_after
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Extractor sidecar connection lost"))
+
+    def close(self) -> None:
+        """Drop the connection (called on shutdown)."""
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "connected": self._writer is not None,
+            "in_flight": len(self._pending),
+            "requests": self.requests,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,190 @@
+"""
+Korean extractor sidecar.
+One long-lived process per node owns the morphological analyzer (a JVM
+for Okt) and serves every API worker over a Unix socket, instead of each
+gunicorn worker starting its own. Concurrent requests are micro-batched:
+once an analysis thread is free, the server waits up to
+KOREAN_EXTRACTOR_SIDECAR_MAX_DELAY seconds for up to
+KOREAN_EXTRACTOR_SIDECAR_MAX_BATCH texts and analyzes them in one call.
+
+Protocol: one JSON object per line. Requests {"id", "text", "min_length"}
+are answered, possibly out of order, with {"id", "words"} or {"id", "error"}.
+Workers connect with services.extractor_client.ExtractorClient.
+
+Usage:
+    python -m services.extractor_sidecar [--socket PATH]
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from core.config import settings
+from services.extractor_client import MAX_LINE
+from services.korean_extractor import KoreanExtractor
+
+
+class _Request(NamedTuple):
+    text: str
+    min_length: int
+    future: asyncio.Future
+
+
+class ExtractorSidecar:
+    def __init__(self, path: str, extractor: Optional[KoreanExtractor] = None,
+                 max_batch: Optional[int] = None, max_delay: Optional[float] = None,
+                 workers: Optional[int] = None):
+        self.path = path
+        self.extractor = extractor or KoreanExtractor()
+        self.max_batch = max_batch or settings.KOREAN_EXTRACTOR_SIDECAR_MAX_BATCH
+        self.max_delay = settings.KOREAN_EXTRACTOR_SIDECAR_MAX_DELAY if max_delay is None else max_delay
+        self.workers = workers or settings.KOREAN_EXTRACTOR_WORKERS
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="extractor-sidecar")
+        self._queue: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self.requests = 0
+        self.batches = 0
+
+    async def start(self) -> None:
+        """Warm up the analyzer, then listen on the socket."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.extractor.warmup)
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # Left behind by a previous run
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_LINE)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._connections):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        for task in [self._batcher, *self._tasks]:
+            if task is not None:
+                task.cancel()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.extractor.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._connections.add(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    request_id, text = request["id"], request["text"]
+                    min_length = int(request.get("min_length", 2))
+                except (ValueError, KeyError, TypeError) as e:
+                    self._reply(writer, {"id": None, "error": f"Bad request: {e}"})
+                    continue
+                self._spawn(self._answer(writer, request_id, text, min_length))
+        except (OSError, ValueError):
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _answer(self, writer: asyncio.StreamWriter, request_id, text: str, min_length: int) -> None:
+        if not text or not text.strip():
+            self._reply(writer, {"id": request_id, "words": []})
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_Request(text, min_length, future))
+        try:
+            self._reply(writer, {"id": request_id, "words": await future})
+        except Exception as e:
+            self._reply(writer, {"id": request_id, "error": str(e)})
+        try:
+            await writer.drain()
+        except OSError:
+            pass  # The worker went away
+
+    def _reply(self, writer: asyncio.StreamWriter, response: Dict[str, object]) -> None:
+        if not writer.is_closing():
+            writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    async def _batch_loop(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            # Requests pile up while every analysis thread is busy
+            await self._slots.acquire()
+            if self._queue.qsize() < self.max_batch - 1 and self.max_delay > 0:
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._spawn(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[_Request]) -> None:
+        try:
+            # Extract with the loosest length and filter per request
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.extractor.extract_words_batch,
+                [request.text for request in batch], min(request.min_length for request in batch)
+            )
+            for request, words in zip(batch, results):
+                if not request.future.done():
+                    request.future.set_result([word for word in words if len(word) >= request.min_length])
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+            self.requests += len(batch)
+            self.batches += 1
+
+    def _spawn(self, coro) -> None:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "connections": len(self._connections),
+            "queued": self._queue.qsize() if self._queue is not None else 0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+        }
+
+
+async def serve(path: str) -> None:
+    """Run the sidecar until SIGINT or SIGTERM."""
+    sidecar = ExtractorSidecar(path)
+    await sidecar.start()
+    print(f"Korean extractor sidecar listening on {path}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    print(f"Korean extractor sidecar stopping: {sidecar.stats()}")
+    await sidecar.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve Korean word extraction over a Unix socket")
+    parser.add_argument("--socket", default=settings.KOREAN_EXTRACTOR_SIDECAR_SOCKET,
+                        help="Socket path (default: KOREAN_EXTRACTOR_SIDECAR_SOCKET)")
+    args = parser.parse_args()
+    if not args.socket:
+        parser.error("Set KOREAN_EXTRACTOR_SIDECAR_SOCKET or pass --socket")
+    asyncio.run(serve(args.socket))
+
+
+if __name__ == "__main__":
+    main()
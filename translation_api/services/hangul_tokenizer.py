@@ -0,0 +1,286 @@
+"""
+JVM-free Korean word extraction.
+Fallback for when KoNLPy is unavailable or too slow. Words are split on
+Hangul runs, copulas and particles (josa) are stripped and predicate
+endings are reduced to the dictionary form (-다), using suffix tries whose
+entries check the final consonant (batchim) of the preceding syllable.
+Heuristic, without a dictionary: it favours common learner sentences over
+full coverage.
+"""
+from typing import Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+import re
+
+_HANGUL_WORD = re.compile(r"[가-힣]+")
+
+_SYLLABLE_BASE = 0xAC00
+_SYLLABLE_COUNT = 11172
+_FINALS = 28
+_MEDIALS = 21
+
+# Final consonant indices
+_NO_FINAL = 0
+_RIEUL = 8
+_BIEUP = 17
+_SSANG_SIOT = 20
+
+# Medial vowel contractions undone when a stem is recovered: 봐 -> 보, 마셔 -> 마시
+_UNCONTRACT = {9: 8, 14: 13, 6: 20, 10: 11}  # ㅘ->ㅗ, ㅝ->ㅜ, ㅕ->ㅣ, ㅙ->ㅚ
+# Vowels a stem can end in before a contracted -요/-서: 가요, 서요, 봐요, 마셔요
+_CONTRACTED_MEDIALS = frozenset({0, 4, 6, 9, 10, 14})
+
+# Conditions on the syllable before a suffix
+ANY = "any"
+FINAL = "final"
+NO_FINAL = "no_final"
+FINAL_NOT_RIEUL = "final_not_rieul"
+NO_FINAL_OR_RIEUL = "no_final_or_rieul"
+FINAL_BIEUP = "final_bieup"
+CONTRACTED = "contracted"
+
+# Predicate endings: how to rebuild the stem before appending 다
+KEEP = "keep"
+DROP_FINAL = "drop_final"
+UNCONTRACT = "uncontract"
+
+STOPWORDS: FrozenSet[str] = frozenset({
+    '이', '가', '을', '를', '은', '는', '의', '에', '와', '과',
+    '도', '만', '부터', '까지', '한테', '께', '로', '으로',
+    '네', '요', '어', '아', '지', '게', '고',
+    '그리고', '그래서', '그런데', '그러나', '하지만', '그러면', '그럼',
+    '정말', '진짜', '너무', '아주', '매우', '조금', '좀', '많이', '다시', '또',
+    '우리', '저희', '이것', '그것', '저것', '여기', '거기', '저기', '이거', '그거', '저거',
+    '무엇', '뭐', '어디', '누구', '언제', '왜', '어떻게',
+})
+
+# Nouns that end in a syllable that looks like a particle
+NOUN_EXCEPTIONS: FrozenSet[str] = frozenset({
+    '고양이', '어린이', '아이', '놀이', '나이', '사이', '오이', '거리', '머리', '다리',
+    '소리', '요리', '우리', '나라', '사과', '과일', '교과', '결과', '효과', '도로',
+    '하루', '오후', '라면', '마을', '가을', '겨울', '노래', '어제', '누나', '언니',
+})
+
+COPULAS: Dict[str, str] = {
+    '이에요': FINAL, '예요': NO_FINAL, '입니다': ANY, '이었어요': FINAL, '였어요': NO_FINAL,
+    '이었다': FINAL, '였다': NO_FINAL, '이다': FINAL, '이야': FINAL,
+}
+
+JOSA: Dict[str, str] = {
+    '이': FINAL, '가': NO_FINAL, '을': FINAL, '를': NO_FINAL, '은': FINAL, '는': NO_FINAL,
+    '과': FINAL, '와': NO_FINAL, '으로': FINAL_NOT_RIEUL, '로': NO_FINAL_OR_RIEUL,
+    '이랑': FINAL, '랑': NO_FINAL, '이나': FINAL, '의': ANY, '에': ANY, '에서': ANY,
+    '에게': ANY, '에게서': ANY, '한테': ANY, '한테서': ANY, '께': ANY, '께서': ANY,
+    '도': ANY, '만': ANY, '부터': ANY, '까지': ANY, '보다': ANY, '처럼': ANY,
+    '마다': ANY, '조차': ANY, '밖에': ANY, '들': ANY,
+}
+
+ENDINGS: Dict[str, Tuple[str, str]] = {
+    '습니다': (FINAL, KEEP), '니다': (FINAL_BIEUP, DROP_FINAL),
+    '습니까': (FINAL, KEEP), '니까': (FINAL_BIEUP, DROP_FINAL),
+    '어요': (FINAL, KEEP), '아요': (FINAL, KEEP), '요': (CONTRACTED, UNCONTRACT),
+    '어서': (FINAL, KEEP), '아서': (FINAL, KEEP), '서': (CONTRACTED, UNCONTRACT),
+    '으세요': (FINAL, KEEP), '세요': (NO_FINAL, KEEP),
+    '고': (FINAL, KEEP), '지만': (ANY, KEEP), '는데': (ANY, KEEP), '은데': (FINAL, KEEP),
+    '으면': (FINAL, KEEP), '어야': (FINAL, KEEP), '아야': (FINAL, KEEP),
+    '야': (CONTRACTED, UNCONTRACT), '다': (ANY, KEEP),
+}
+
+# Connective endings recognised only before an auxiliary predicate:
+# 마시고 싶어요, 보고 있어요, 먹지 않았어요. Alone they are too ambiguous
+# with nouns (최고, 사고)
+AUXILIARY_CONNECTIVES: Dict[str, Tuple[str, ...]] = {
+    '고': ('싶', '있', '계', '말'),
+    '지': ('않', '못', '말'),
+}
+
+# Stems that drop their final ㅂ before a vowel: 어려워요 -> 어렵다
+B_IRREGULAR: FrozenSet[str] = frozenset({
+    '어렵', '쉽', '가깝', '덥', '춥', '맵', '고맙', '반갑', '즐겁', '무섭', '아름답',
+    '귀엽', '무겁', '가볍', '시끄럽', '더럽', '부럽', '새롭', '외롭', '아깝', '그립',
+})
+
+# Stems that drop their ㅡ before a vowel: 썼어요 -> 쓰다, 바빠요 -> 바쁘다
+EU_IRREGULAR: Dict[str, str] = {
+    '써': '쓰', '커': '크', '꺼': '끄', '떠': '뜨', '바빠': '바쁘', '예뻐': '예쁘',
+    '기뻐': '기쁘', '나빠': '나쁘', '아파': '아프', '슬퍼': '슬프', '고파': '고프',
+}
+
+
+def decompose(syllable: str) -> Optional[Tuple[int, int, int]]:
+    """Return the (initial, medial, final) indices of a Hangul syllable."""
+    code = ord(syllable) - _SYLLABLE_BASE
+    if not 0 <= code < _SYLLABLE_COUNT:
+        return None
+    return code // (_MEDIALS * _FINALS), (code // _FINALS) % _MEDIALS, code % _FINALS
+
+
+def compose(initial: int, medial: int, final: int) -> str:
+    return chr(_SYLLABLE_BASE + (initial * _MEDIALS + medial) * _FINALS + final)
+
+
+def _matches(condition: str, syllable: str) -> bool:
+    parts = decompose(syllable)
+    if parts is None:
+        return False
+    _, medial, final = parts
+    if condition == ANY:
+        return True
+    if condition == FINAL:
+        return final != _NO_FINAL
+    if condition == NO_FINAL:
+        return final == _NO_FINAL
+    if condition == FINAL_NOT_RIEUL:
+        return final not in (_NO_FINAL, _RIEUL)
+    if condition == NO_FINAL_OR_RIEUL:
+        return final in (_NO_FINAL, _RIEUL)
+    if condition == FINAL_BIEUP:
+        return final == _BIEUP
+    if condition == CONTRACTED:
+        return final == _NO_FINAL and (medial in _CONTRACTED_MEDIALS or syllable == '해')
+    raise ValueError(f"Unknown condition: {condition}")
+
+
+def _uncontract(syllable: str) -> str:
+    if syllable == '해':
+        return '하'
+    initial, medial, final = decompose(syllable)
+    return compose(initial, _UNCONTRACT.get(medial, medial), final)
+
+
+class SuffixTrie:
+    """Trie over reversed suffixes, for longest-first suffix lookup."""
+
+    def __init__(self, entries: Dict[str, object]):
+        self._root: dict = {}
+        for suffix, value in entries.items():
+            node = self._root
+            for char in reversed(suffix):
+                node = node.setdefault(char, {})
+            node[None] = value
+
+    def suffixes(self, word: str) -> Iterator[Tuple[int, object]]:
+        """Yield `(length, value)` of every suffix of `word` in the trie, longest first."""
+        found = []
+        node = self._root
+        for length, char in enumerate(reversed(word), 1):
+            node = node.get(char)
+            if node is None:
+                break
+            if None in node:
+                found.append((length, node[None]))
+        return reversed(found)
+
+
+_COPULA_TRIE = SuffixTrie(COPULAS)
+_JOSA_TRIE = SuffixTrie(JOSA)
+# Particles distinctive enough to win over predicate endings (주말마다);
+# 보다 is left to the verb (바라보다)
+_LONG_JOSA_TRIE = SuffixTrie({
+    josa: condition for josa, condition in JOSA.items()
+    if len(josa) > 1 and josa != '보다'
+})
+_ENDING_TRIE = SuffixTrie(ENDINGS)
+
+
+def _strip(word: str, trie: SuffixTrie) -> Optional[str]:
+    """Strip the longest suffix whose condition holds, keeping a non-empty stem."""
+    for length, condition in trie.suffixes(word):
+        stem = word[:-length]
+        if stem and _matches(condition, stem[-1]):
+            return stem
+    return None
+
+
+def _with_final(syllable: str, final: int) -> str:
+    initial, medial, _ = decompose(syllable)
+    return compose(initial, medial, final)
+
+
+def _predicate_stem(stem: str, action: str) -> str:
+    if action == DROP_FINAL:
+        stem = stem[:-1] + _with_final(stem[-1], _NO_FINAL)
+    elif action == UNCONTRACT:
+        stem = stem[:-1] + _uncontract(stem[-1])
+    # Past and future markers: 먹었 -> 먹, 했 -> 하, 마셨 -> 마시, 먹겠 -> 먹
+    if len(stem) > 1 and stem[-1] in ('었', '았', '였', '겠'):
+        stem = stem[:-1]
+    elif decompose(stem[-1])[2] == _SSANG_SIOT and not stem.endswith('있'):
+        stem = stem[:-1] + _uncontract(_with_final(stem[-1], _NO_FINAL))
+
+    # Irregular stems
+    for surface, lemma in EU_IRREGULAR.items():
+        if stem.endswith(surface):
+            return stem[:-len(surface)] + lemma
+    if len(stem) > 1 and stem[-1] in ('라', '러') and decompose(stem[-2])[2] == _RIEUL:
+        # 르 irregular: 불러 -> 부르, 빨라 -> 빠르
+        return stem[:-2] + _with_final(stem[-2], _NO_FINAL) + '르'
+    if len(stem) > 1 and stem[-1] == '우':
+        candidate = stem[:-2] + _with_final(stem[-2], _BIEUP)
+        if candidate in B_IRREGULAR:
+            return candidate
+    return stem
+
+
+NOUN = "Noun"
+PREDICATE = "Predicate"  # Verb or adjective; there is no dictionary to tell them apart
+
+
+def lemmatize(word: str, next_word: str = "") -> str:
+    """
+    Reduce one Hangul word to a noun without particles or a -다 predicate.
+    `next_word` is the following word, used to recognise auxiliaries.
+    """
+    return tag_word(word, next_word)[0]
+
+
+def tag_word(word: str, next_word: str = "") -> Tuple[str, str]:
+    """Return the lemma of `word` and whether it is a NOUN or a PREDICATE."""
+    if word in NOUN_EXCEPTIONS:
+        return word, NOUN
+    stem = _strip(word, _COPULA_TRIE)
+    if stem is not None:
+        return (stem if stem in NOUN_EXCEPTIONS else _strip_josa(stem)), NOUN
+    stem = _strip(word, _LONG_JOSA_TRIE)
+    if stem is not None:
+        return _strip_josa(stem), NOUN
+
+    auxiliaries = AUXILIARY_CONNECTIVES.get(word[-1])
+    if auxiliaries and len(word) > 1 and next_word.startswith(auxiliaries):
+        return _predicate_stem(word[:-1], KEEP) + '다', PREDICATE
+
+    for length, (condition, action) in _ENDING_TRIE.suffixes(word):
+        stem = word[:-length]
+        if stem and _matches(condition, stem[-1]):
+            return _predicate_stem(stem, action) + '다', PREDICATE
+
+    return _strip_josa(word), NOUN
+
+
+def _strip_josa(word: str) -> str:
+    # At most two stacked particles, e.g. 학교에서는
+    for _ in range(2):
+        if word in NOUN_EXCEPTIONS:
+            break
+        stem = _strip(word, _JOSA_TRIE)
+        if stem is None:
+            break
+        word = stem
+    return word
+
+
+def pos(text: str) -> List[Tuple[str, str]]:
+    """Return `(lemma, NOUN or PREDICATE)` for every non-stopword Hangul word."""
+    tags = []
+    tokens = _HANGUL_WORD.findall(text)
+    for index, token in enumerate(tokens):
+        if token in STOPWORDS:
+            continue
+        lemma, tag = tag_word(token, tokens[index + 1] if index + 1 < len(tokens) else "")
+        if lemma not in STOPWORDS:
+            tags.append((lemma, tag))
+    return tags
+
+
+def extract_words(text: str, min_length: int = 2) -> List[str]:
+    """Extract unique lemmas of at least `min_length` characters from text."""
+    return list({lemma for lemma, _ in pos(text) if len(lemma) >= min_length})
@@ -1,24 +1,122 @@
 """
-Korean vocabulary extraction service using KoNLPy.
-Extracts meaningful words from Korean text.
+Korean vocabulary extraction service.
+Extracts meaningful words from Korean text with the morphological
+analyzer selected by KOREAN_ANALYZER_BACKEND, or the JVM-free fallback.
+With KOREAN_EXTRACTOR_SIDECAR_SOCKET set, async extraction is sent to
+the node's extractor sidecar and the analyzer is never started here.
 """
-from typing import List, Set
-import re
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Set
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
 
-try:
-    from konlpy.tag import Okt
-    KONLPY_AVAILABLE = True
-except ImportError:
-    KONLPY_AVAILABLE = False
-    print("Warning: KoNLPy not available. Using fallback word extraction.")
+from core.config import settings
+from services import hangul_tokenizer
+from services.analyzers import BACKENDS, AnalyzerBackend, create_backend
+from services.extractor_client import ExtractorClient
+from services.pos_cache import PosCache
+
+# Tags worth learning as vocabulary
+_VOCABULARY_TAGS = ('Noun', 'Verb', 'Adjective')
+
+
+class ExtractionProgress(NamedTuple):
+    words: Set[str]  # Words first seen in this chunk
+    texts_done: int
+    texts_total: int
+    texts_per_second: float
+
+
+# Per-process extractor of the batch extraction pool, warmed up on start
+_worker_extractor: Optional["KoreanExtractor"] = None
+
+
+def _init_batch_worker() -> None:
+    global _worker_extractor
+    _worker_extractor = KoreanExtractor()
+    _worker_extractor.warmup()
+
+
+def _extract_chunk(texts: List[str], min_length: int) -> Set[str]:
+    return _worker_extractor.extract_unique_words(texts, min_length)
 
 
 class KoreanExtractor:
     def __init__(self):
-        if KONLPY_AVAILABLE:
-            self.okt = Okt()
-        else:
-            self.okt = None
+        # Analyzers like Okt start a JVM, so the backend is only created on first use
+        self._analyzer: Optional[AnalyzerBackend] = None
+        self._analyzer_failed = False
+        self._analyzer_lock = threading.Lock()
+        # Okt runs in Java and Kiwi in native code, both releasing the GIL,
+        # so threads analyze in parallel
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.timeouts = 0
+        self.overflows = 0
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._processes = 0
+        self._sidecar: Optional[ExtractorClient] = None
+        self.pos_cache = PosCache(
+            settings.KOREAN_POS_CACHE_MAX_ENTRIES,
+            settings.KOREAN_POS_CACHE_MAX_BYTES,
+            settings.KOREAN_POS_CACHE_TTL_SECONDS,
+            settings.KOREAN_POS_CACHE_DB_PATH
+        )
+
+    @property
+    def analyzer(self) -> Optional[AnalyzerBackend]:
+        """
+        The configured analyzer backend, created on first access. None
+        when the fallback is configured ("hangul") or the backend can't run.
+        """
+        if self._analyzer is None and self.available:
+            with self._analyzer_lock:
+                if self._analyzer is None and not self._analyzer_failed:
+                    try:
+                        self._analyzer = create_backend(settings.KOREAN_ANALYZER_BACKEND)
+                    except Exception as e:
+                        self._analyzer_failed = True
+                        print(f"Failed to start the {settings.KOREAN_ANALYZER_BACKEND} analyzer, "
+                              f"using fallback word extraction: {e}")
+        return self._analyzer
+
+    @analyzer.setter
+    def analyzer(self, value: Optional[AnalyzerBackend]):
+        self._analyzer = value
+
+    @property
+    def available(self) -> bool:
+        """Whether an analyzer is, or can be, used, without starting it."""
+        if self._analyzer is not None:
+            return True
+        backend = BACKENDS.get(settings.KOREAN_ANALYZER_BACKEND)
+        return (backend is not None and backend.available and backend.name != "hangul"
+                and not self._analyzer_failed)
+
+    def warmup(self) -> None:
+        """Start the analyzer, load the dictionaries and run a representative sentence."""
+        try:
+            if self.analyzer:
+                self.analyzer.warmup()
+        except Exception as e:
+            print(f"Analyzer warmup failed: {e}")
+
+    async def warmup_async(self) -> None:
+        """Warm up on the analysis pool, off the event loop."""
+        if self.available and not settings.KOREAN_EXTRACTOR_SIDECAR_SOCKET:
+            await asyncio.get_running_loop().run_in_executor(self._get_executor(), self.warmup)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.KOREAN_EXTRACTOR_WORKERS,
+                thread_name_prefix="korean-extractor"
+            )
+        return self._executor
     
     def extract_words(self, text: str, min_length: int = 2) -> List[str]:
         """
@@ -34,55 +132,131 @@ class KoreanExtractor:
         if not text or not text.strip():
             return []
         
-        if self.okt:
-            return self._extract_with_konlpy(text, min_length)
+        if self.analyzer:
+            return self._extract_with_analyzer(text, min_length)
         else:
             return self._extract_fallback(text, min_length)
     
-    def _extract_with_konlpy(self, text: str, min_length: int) -> List[str]:
-        """Extract words using KoNLPy morphological analysis."""
+    def _extract_with_analyzer(self, text: str, min_length: int) -> List[str]:
+        """Extract words using morphological analysis."""
         try:
-            # Use morphs() to get basic morphemes
-            # Filter for nouns, verbs, adjectives (meaningful words)
-            pos_tags = self.okt.pos(text, stem=True)
-            
-            words = []
-            for word, pos in pos_tags:
-                # Keep nouns, verbs, adjectives
-                if pos in ['Noun', 'Verb', 'Adjective'] and len(word) >= min_length:
-                    # Filter out common particles and very short words
-                    if self._is_meaningful_word(word):
-                        words.append(word)
-            
-            return list(set(words))  # Remove duplicates
+            analyzer = self.analyzer
+            # Tags are lemmatized (stem=True for Okt), cached per backend
+            pos_tags = self.pos_cache.get_or_analyze(text, analyzer.name, analyzer.pos)
+            return self._vocabulary(pos_tags, min_length)
         except Exception as e:
-            print(f"KoNLPy extraction failed: {e}")
+            print(f"Morphological extraction failed: {e}")
             return self._extract_fallback(text, min_length)
+
+    def _vocabulary(self, pos_tags, min_length: int) -> List[str]:
+        words = []
+        for word, pos in pos_tags:
+            # Keep nouns, verbs, adjectives
+            if pos in _VOCABULARY_TAGS and len(word) >= min_length:
+                # Filter out common particles and very short words
+                if self._is_meaningful_word(word):
+                    words.append(word)
+
+        return list(set(words))  # Remove duplicates
+
+    def extract_words_batch(self, texts: List[str], min_length: int = 2) -> List[List[str]]:
+        """
+        Extract words from each of `texts`, analyzing the uncached ones in
+        a single analyzer call. Used by the sidecar for its micro-batches.
+        """
+        if not self.analyzer:
+            return [self.extract_words(text, min_length) for text in texts]
+        try:
+            analyzer = self.analyzer
+            all_tags = self.pos_cache.get_or_analyze_many(texts, analyzer.name, analyzer.pos_batch)
+            return [self._vocabulary(pos_tags, min_length) for pos_tags in all_tags]
+        except Exception as e:
+            print(f"Morphological extraction failed: {e}")
+            return [self._extract_fallback(text, min_length) for text in texts]
     
     def _extract_fallback(self, text: str, min_length: int) -> List[str]:
-        """Fallback extraction using simple regex (less accurate)."""
-        # Extract sequences of Korean characters
-        korean_pattern = re.compile(r'[가-힣]+')
-        words = korean_pattern.findall(text)
-        
-        # Filter by length and remove duplicates
-        meaningful_words = [
-            word for word in words 
-            if len(word) >= min_length and self._is_meaningful_word(word)
-        ]
-        
-        return list(set(meaningful_words))
+        """Fallback extraction without the JVM: josa and ending stripping."""
+        return hangul_tokenizer.extract_words(text, min_length)
     
     def _is_meaningful_word(self, word: str) -> bool:
         """Check if word is meaningful (not a common particle or filler)."""
-        # Common Korean particles and fillers to exclude
-        exclude = {
-            '이', '가', '을', '를', '은', '는', '의', '에', '와', '과',
-            '도', '만', '부터', '까지', '한테', '께', '로', '으로',
-            '네', '요', '어', '아', '지', '게', '고',
-        }
-        return word not in exclude
+        return word not in hangul_tokenizer.STOPWORDS
     
+    async def extract_words_async(self, text: str, min_length: int = 2) -> List[str]:
+        """
+        Extract words without blocking the event loop.
+
+        Analysis runs on a dedicated thread pool. When more than
+        KOREAN_EXTRACTOR_MAX_PENDING analyses are queued, or one takes
+        longer than KOREAN_EXTRACTOR_TIMEOUT seconds, the JVM-free
+        fallback answers instead.
+
+        With a sidecar configured, the text is analyzed there instead,
+        within KOREAN_EXTRACTOR_SIDECAR_TIMEOUT seconds.
+        """
+        if not text or not text.strip():
+            return []
+        if settings.KOREAN_EXTRACTOR_SIDECAR_SOCKET:
+            return await self._get_sidecar().extract_words(text, min_length)
+        if not self.available:
+            return self._extract_fallback(text, min_length)
+
+        with self._lock:
+            if self._pending >= settings.KOREAN_EXTRACTOR_MAX_PENDING:
+                self.overflows += 1
+                return self._extract_fallback(text, min_length)
+            self._pending += 1
+        future = self._get_executor().submit(self._extract_in_worker, text, min_length)
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), settings.KOREAN_EXTRACTOR_TIMEOUT)
+        except asyncio.TimeoutError:
+            # A queued analysis is cancelled; a running one finishes unobserved
+            self.timeouts += 1
+            return self._extract_fallback(text, min_length)
+
+    def _extract_in_worker(self, text: str, min_length: int) -> List[str]:
+        if not self.analyzer:
+            return self._extract_fallback(text, min_length)
+        return self._extract_with_analyzer(text, min_length)
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _get_sidecar(self) -> ExtractorClient:
+        if self._sidecar is None:
+            self._sidecar = ExtractorClient(
+                settings.KOREAN_EXTRACTOR_SIDECAR_SOCKET,
+                settings.KOREAN_EXTRACTOR_SIDECAR_TIMEOUT,
+                settings.KOREAN_EXTRACTOR_SIDECAR_RETRY_SECONDS
+            )
+        return self._sidecar
+
+    def close(self) -> None:
+        """Stop the analysis threads (called on shutdown)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+        if self._sidecar is not None:
+            self._sidecar.close()
+            self._sidecar = None
+        self.pos_cache.close()
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = {
+            "pending": self._pending,
+            "timeouts": self.timeouts,
+            "overflows": self.overflows,
+            "pos_cache": self.pos_cache.stats(),
+        }
+        if self._sidecar is not None:
+            stats["sidecar"] = self._sidecar.stats()
+        return stats
+
     def extract_unique_words(self, texts: List[str], min_length: int = 2) -> Set[str]:
         """Extract unique words from multiple texts."""
         all_words = set()
@@ -91,6 +265,69 @@ class KoreanExtractor:
             all_words.update(words)
         return all_words
 
+    async def extract_unique_words_parallel(
+        self, texts: List[str], min_length: int = 2, chunk_size: Optional[int] = None
+    ) -> AsyncIterator[ExtractionProgress]:
+        """
+        Extract unique words from many texts on a process pool.
+
+        Texts are split into chunks analyzed by KOREAN_EXTRACTOR_PROCESSES
+        worker processes, each with its own warm analyzer. Progress is yielded
+        as chunks complete, in completion order, with the words not seen
+        in earlier chunks and the throughput so far. Without an analyzer
+        the JVM-free fallback runs in-process.
+        """
+        chunk_size = chunk_size or settings.KOREAN_EXTRACTOR_CHUNK_SIZE
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        started = time.monotonic()
+        seen: Set[str] = set()
+        done = 0
+
+        def progress(chunk: List[str], words: Set[str]) -> ExtractionProgress:
+            nonlocal done
+            new_words = words - seen
+            seen.update(new_words)
+            done += len(chunk)
+            elapsed = time.monotonic() - started
+            return ExtractionProgress(new_words, done, len(texts), done / elapsed if elapsed else 0.0)
+
+        if not self.available:
+            for chunk in chunks:
+                yield progress(chunk, self.extract_unique_words(chunk, min_length))
+            return
+
+        pool = self._get_process_pool()
+        loop = asyncio.get_running_loop()
+        # Keep a couple of chunks per process in flight to bound memory
+        window = 2 * self._processes
+        remaining = iter(chunks)
+        pending: Dict[asyncio.Future, List[str]] = {}
+        try:
+            while True:
+                for chunk in remaining:
+                    pending[loop.run_in_executor(pool, _extract_chunk, chunk, min_length)] = chunk
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    return
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for future in finished:
+                    yield progress(pending.pop(future), future.result())
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _get_process_pool(self) -> ProcessPoolExecutor:
+        if self._process_pool is None:
+            self._processes = settings.KOREAN_EXTRACTOR_PROCESSES or os.cpu_count() or 1
+            # Spawned, not forked: a forked child can't use the parent's JVM
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self._processes,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_batch_worker
+            )
+        return self._process_pool
+
 
 # Singleton instance
 korean_extractor = KoreanExtractor()
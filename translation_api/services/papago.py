@@ -0,0 +1,76 @@
+"""
+Papago translation client.
+Keeps one pooled, keep-alive HTTP client for all outbound Papago calls.
+"""
+from typing import Optional
+
+import httpx
+
+from core.config import settings
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class PapagoError(Exception):
+    """Papago answered with a non-200 response."""
+
+    def __init__(self, status_code: int, body: str):
+        super().__init__(f"Papago API error: {body}")
+        self.status_code = status_code
+        self.body = body
+
+
+class PapagoClient:
+    def __init__(self):
+        self.client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        """Create the shared HTTP client (called from the app lifespan)."""
+        if self.client is None:
+            self.client = httpx.AsyncClient(
+                http2=settings.PAPAGO_HTTP2 and HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=settings.PAPAGO_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.PAPAGO_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.PAPAGO_KEEPALIVE_EXPIRY
+                ),
+                timeout=httpx.Timeout(
+                    settings.PAPAGO_READ_TIMEOUT,
+                    connect=settings.PAPAGO_CONNECT_TIMEOUT
+                )
+            )
+
+    async def close(self):
+        """Close pooled connections (called on shutdown)."""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate text with Papago and return the translated text."""
+        if self.client is None:
+            await self.start()
+        response = await self.client.post(
+            settings.PAPAGO_URL,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                "X-Naver-Client-Id": settings.PAPAGO_CLIENT_ID,
+                "X-Naver-Client-Secret": settings.PAPAGO_CLIENT_SECRET,
+            },
+            data={
+                "source": source_lang,
+                "target": target_lang,
+                "text": text
+            }
+        )
+        if response.status_code != 200:
+            raise PapagoError(response.status_code, response.text)
+        return response.json()["message"]["result"]["translatedText"]
+
+
+# Global client instance
+papago = PapagoClient()
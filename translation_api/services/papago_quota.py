@@ -0,0 +1,135 @@
+"""
+Papago quota manager.
+Meters outbound characters and calls against Papago's daily character
+quota and per-second call rate, shared by every worker on the host. The
+character quota is counted per day in PAPAGO_QUOTA_RESET_TIMEZONE, as
+Papago resets it at a fixed time rather than refilling it continuously.
+Requests over budget wait briefly instead of failing, interactive ones
+ahead of bulk ones; once the wait would be too long they are rejected,
+which leaves the service answering from the translation cache only.
+"""
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, time, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from core.config import settings
+from core.token_bucket import Bucket, Budget, PeriodQuota, SharedTokenBuckets
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Priority of Papago calls made from the current task
+priority: ContextVar[str] = ContextVar("papago_priority", default=INTERACTIVE)
+
+# How often queued requests re-check the buckets
+POLL_INTERVAL = 0.05
+
+
+@contextmanager
+def bulk_priority() -> Iterator[None]:
+    """Run Papago calls made inside the block at bulk priority."""
+    token = priority.set(BULK)
+    try:
+        yield
+    finally:
+        priority.reset(token)
+
+
+class QuotaExceededError(Exception):
+    """The Papago budget can't cover a request within the allowed wait."""
+    status_code = 429
+
+
+class PapagoQuota:
+    def __init__(self, buckets: SharedTokenBuckets, daily_chars: int, calls_per_second: float,
+                 max_wait: float, bulk_reserve_ratio: float, reset_timezone: str = "Asia/Seoul"):
+        self.buckets = buckets
+        self.chars = PeriodQuota("papago_chars", daily_chars) if daily_chars > 0 else None
+        self.calls = Bucket("papago_calls", calls_per_second, calls_per_second) if calls_per_second > 0 else None
+        self.max_wait = max_wait
+        self.bulk_reserve_ratio = bulk_reserve_ratio
+        self.reset_zone = ZoneInfo(reset_timezone)
+        self.waiting = {INTERACTIVE: 0, BULK: 0}
+        self.throttled = 0
+        self.rejected = 0
+
+    def _buckets(self) -> List[Budget]:
+        return [bucket for bucket in (self.chars, self.calls) if bucket is not None]
+
+    def _period(self) -> Tuple[str, float]:
+        """Return the current quota day and the seconds until it resets."""
+        now = datetime.now(self.reset_zone)
+        reset = datetime.combine(now.date() + timedelta(days=1), time(), tzinfo=self.reset_zone)
+        return now.date().isoformat(), (reset - now).total_seconds()
+
+    async def acquire(self, chars: int) -> None:
+        """
+        Wait until `chars` characters and one call are within budget.
+
+        Bulk requests leave a reserve of the daily characters to
+        interactive ones and yield to interactive requests queued in this
+        worker. Raises QuotaExceededError if the budget can't be met
+        within `max_wait` seconds.
+        """
+        buckets = self._buckets()
+        if not buckets:
+            return
+        level = priority.get()
+        costs = {bucket: (chars if bucket is self.chars else 1) for bucket in buckets}
+        reserves = {}
+        if level == BULK and self.chars is not None:
+            reserves[self.chars] = self.chars.limit * self.bulk_reserve_ratio
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        self.waiting[level] += 1
+        try:
+            throttled = False
+            while True:
+                if level == BULK and self.waiting[INTERACTIVE]:
+                    wait = POLL_INTERVAL
+                else:
+                    wait = await asyncio.to_thread(self.buckets.take, costs, reserves, *self._period())
+                    if wait == 0.0:
+                        return
+                if loop.time() + wait > deadline:
+                    self.rejected += 1
+                    raise QuotaExceededError("Papago quota exhausted, try again later")
+                if not throttled:
+                    throttled = True
+                    self.throttled += 1
+                await asyncio.sleep(min(wait, POLL_INTERVAL))
+        finally:
+            self.waiting[level] -= 1
+
+    def stats(self) -> Dict[str, object]:
+        """Return remaining budget and queueing counters."""
+        remaining = self.buckets.levels(self._buckets(), self._period()[0]) if self._buckets() else {}
+        return {
+            "remaining_daily_chars": remaining.get("papago_chars"),
+            "remaining_calls": remaining.get("papago_calls"),
+            "waiting": dict(self.waiting),
+            "throttled": self.throttled,
+            "rejected": self.rejected,
+        }
+
+    def close(self) -> None:
+        self.buckets.close()
+
+
+def build_quota(path: Optional[str] = None) -> PapagoQuota:
+    return PapagoQuota(
+        SharedTokenBuckets(path or settings.PAPAGO_QUOTA_DB_PATH or ":memory:"),
+        daily_chars=settings.PAPAGO_DAILY_CHAR_LIMIT,
+        calls_per_second=settings.PAPAGO_CALLS_PER_SECOND,
+        max_wait=settings.PAPAGO_QUOTA_MAX_WAIT,
+        bulk_reserve_ratio=settings.PAPAGO_BULK_RESERVE_RATIO,
+        reset_timezone=settings.PAPAGO_QUOTA_RESET_TIMEZONE
+    )
+
+
+# Singleton instance
+papago_quota = build_quota()
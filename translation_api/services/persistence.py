@@ -0,0 +1,67 @@
+"""
+Translation persistence.
+Saving a translation writes it, its stats and the vocabulary upsert to
+PocketBase. Saved texts are not added to the translation memory, which
+is shared by all users and only holds provider output. Saves requested from
+the proxy path go through a bounded background queue instead of holding
+up the response.
+"""
+from typing import Any, Dict, Optional
+
+from core.background_queue import BackgroundQueue
+from core.config import settings
+from core.pocketbase_client import new_record_id, pocketbase
+
+persist_queue = BackgroundQueue(
+    settings.PERSIST_QUEUE_MAX_SIZE,
+    settings.PERSIST_QUEUE_WORKERS,
+    settings.PERSIST_QUEUE_MAX_RETRIES,
+    settings.PERSIST_QUEUE_RETRY_BACKOFF
+)
+
+
+async def save_translation(user_id: str, source_text: str, translated_text: str,
+                           source_lang: str, target_lang: str, token: str,
+                           record_id: Optional[str] = None) -> Dict[str, Any]:
+    """Save a translation with its stats and vocabulary upsert."""
+    return await pocketbase.save_translation(
+        user_id=user_id,
+        source_text=source_text,
+        translated_text=translated_text,
+        source_lang=source_lang,
+        target_lang=target_lang,
+        token=token,
+        record_id=record_id
+    )
+
+
+async def save_translation_later(user_id: str, source_text: str, translated_text: str,
+                                 source_lang: str, target_lang: str, token: str) -> None:
+    """
+    Queue a translation save. When the queue is full the save runs
+    inline, so a burst slows requests down instead of losing saves; an
+    inline failure is logged and counted, never raised, since the caller
+    has already translated the text.
+
+    The queue retries failed saves, and a timeout or 5xx may arrive after
+    PocketBase committed the batch. The record id is therefore chosen once,
+    and a retry that finds the record saved stops there instead of
+    inserting a duplicate and counting the vocabulary and stats twice.
+    """
+    record_id = new_record_id()
+    attempted = False
+
+    async def job() -> None:
+        nonlocal attempted
+        if attempted and await pocketbase.translation_exists(record_id):
+            return
+        attempted = True
+        await save_translation(user_id, source_text, translated_text, source_lang, target_lang,
+                               token, record_id=record_id)
+
+    if not persist_queue.submit(job):
+        try:
+            await job()
+        except Exception as e:
+            persist_queue.failed += 1
+            print(f"Inline translation save failed: {e}")
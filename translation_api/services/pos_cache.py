@@ -0,0 +1,84 @@
+"""
+Morphological-analysis result cache.
+The same sentences are analyzed again on re-saves, summaries and
+backfills, so POS tags are kept keyed by a hash of the text and the
+analysis options (the analyzer backend): in a per-process LRU bounded by memory, optionally
+backed by a SQLite file kept across restarts. Calls are blocking and
+thread-safe, so they can run on the extractor's analysis threads.
+"""
+import hashlib
+import json
+import sys
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+from core.disk_cache import SQLiteCache
+
+PosTags = Tuple[Tuple[str, str], ...]
+
+
+def pos_cache_key(text: str, options: str) -> str:
+    return f"{options}:{hashlib.sha256(text.encode('utf-8')).hexdigest()}"
+
+
+def _entry_size(key: str, tags: PosTags) -> int:
+    # Rough CPython footprint; the tag names are shared constants
+    return sys.getsizeof(key) + sys.getsizeof(tags) + sum(
+        sys.getsizeof(pair) + sys.getsizeof(pair[0]) for pair in tags
+    )
+
+
+class PosCache:
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float, db_path: str = ""):
+        self.memory = TTLCache(max_size=max_entries, ttl=ttl, max_bytes=max_bytes, sizeof=_entry_size)
+        self.disk: Optional[SQLiteCache] = None
+        if db_path:
+            self.disk = SQLiteCache(db_path, ttl=ttl, max_entries=settings.KOREAN_POS_CACHE_DB_MAX_ENTRIES)
+        self._lock = threading.Lock()
+
+    def get_or_analyze(self, text: str, options: str,
+                       analyze: Callable[[str], List[Tuple[str, str]]]) -> PosTags:
+        """Return cached tags for `text`, running `analyze(text)` on a miss."""
+        return self.get_or_analyze_many([text], options, lambda texts: [analyze(texts[0])])[0]
+
+    def get_or_analyze_many(self, texts: List[str], options: str,
+                            analyze: Callable[[List[str]], List[List[Tuple[str, str]]]]) -> List[PosTags]:
+        """Return cached tags for each of `texts`, analyzing all misses in one `analyze` call."""
+        keys = [pos_cache_key(text, options) for text in texts]
+        results: List[Optional[PosTags]] = []
+        with self._lock:
+            for key in keys:
+                results.append(self.memory.get(key))
+
+        found: Dict[str, PosTags] = {}
+        missing = [i for i, tags in enumerate(results) if tags is None]
+        if missing and self.disk is not None:
+            for i in missing:
+                stored = self.disk.get(keys[i])
+                if stored is not None:
+                    results[i] = found[keys[i]] = tuple(tuple(pair) for pair in json.loads(stored))
+            missing = [i for i in missing if results[i] is None]
+        if missing:
+            analyzed = analyze([texts[i] for i in missing])
+            for i, tags in zip(missing, analyzed):
+                results[i] = found[keys[i]] = tuple(tuple(pair) for pair in tags)
+                if self.disk is not None:
+                    self.disk.set(keys[i], json.dumps(results[i], ensure_ascii=False))
+        with self._lock:
+            for key, tags in found.items():
+                self.memory.set(key, tags)
+        return results
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, object]:
+        stats: Dict[str, object] = self.memory.stats()
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
@@ -0,0 +1,124 @@
+"""
+Per-user translation stats rollups.
+
+Counts live in the `translation_stats` collection, one row per user,
+direction and 15-minute UTC slot plus one all-time row per direction.
+PocketBaseClient.save_translation/delete_translation keep them current in
+the same transaction as the translation itself; this module reads them
+and rebuilds them from the translation history.
+"""
+import asyncio
+import sys
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone, tzinfo
+from typing import Optional
+
+from core.pocketbase_client import (
+    filter_literal,
+    parse_datetime,
+    pocketbase,
+    stats_slot,
+    stats_upsert_request,
+)
+from schemas.translation import TranslationStats
+
+# Largest batch the PocketBase batch API is configured to accept
+BACKFILL_BATCH_SIZE = 50
+
+
+def _count(row: dict) -> int:
+    # Deleting a translation saved before the rollups were backfilled
+    # decrements a row that never counted it; don't report below zero
+    return max(0, row["count"])
+
+
+async def get_translation_stats(user_id: str, token: str, tz: tzinfo,
+                                now: Optional[datetime] = None) -> TranslationStats:
+    """
+    Read a user's stats from the rollups.
+
+    "today" and "this week" (starting Monday) follow the day boundaries
+    of `tz`. Cost is proportional to the active slots of the current week,
+    not to the size of the history.
+    """
+    local_now = (now or datetime.now(timezone.utc)).astimezone(tz)
+    today_start = datetime.combine(local_now.date(), time(), tzinfo=tz)
+    week_start = today_start - timedelta(days=local_now.weekday())
+    user_filter = f"user.id={filter_literal(user_id)}"
+
+    async def count_since(start: datetime) -> tuple[int, int]:
+        today = this_week = 0
+        today_slot = stats_slot(today_start)
+        async for row in pocketbase.iter_records(
+            "translation_stats", token,
+            f"{user_filter} && slot >= {filter_literal(stats_slot(start))}",
+            sort_field="slot", fields=["count"]
+        ):
+            this_week += _count(row)
+            if row["slot"] >= today_slot:
+                today += _count(row)
+        return today, this_week
+
+    totals, (today, this_week) = await asyncio.gather(
+        pocketbase.list_records(
+            "translation_stats", token, f"{user_filter} && slot = ''",
+            fields=["source_lang", "target_lang", "count"], skip_total=True
+        ),
+        count_since(week_start)
+    )
+
+    by_direction = Counter()
+    for row in totals["items"]:
+        by_direction[(row["source_lang"], row["target_lang"])] += _count(row)
+
+    return TranslationStats(
+        total_translations=sum(by_direction.values()),
+        this_week=this_week,
+        today=today,
+        korean_to_english=by_direction[("ko", "en")],
+        english_to_korean=by_direction[("en", "ko")]
+    )
+
+
+async def backfill(user_id: Optional[str] = None) -> int:
+    """
+    Rebuild stats rollups from the translations collection.
+
+    Rebuilds every user's rollups, or only `user_id`'s. Rows for slots that
+    no longer have translations are reset to zero. Counts are written as
+    absolute values, so run it while the user(s) are not saving. Returns
+    the number of rows written.
+    """
+    user_filter = f"user.id={filter_literal(user_id)}" if user_id else ""
+    counts: Counter = Counter()
+
+    async with pocketbase:
+        # Superuser token: "" makes the client use the cached admin header
+        async for item in pocketbase.iter_records(
+            "translations", "", user_filter, "created",
+            fields=["user", "source_lang", "target_lang"]
+        ):
+            slot = stats_slot(parse_datetime(item["created"]))
+            for key_slot in (slot, ""):
+                counts[(item["user"], key_slot, item["source_lang"], item["target_lang"])] += 1
+
+        async for row in pocketbase.iter_records(
+            "translation_stats", "", user_filter, "slot",
+            fields=["user", "source_lang", "target_lang", "count"]
+        ):
+            counts.setdefault((row["user"], row["slot"], row["source_lang"], row["target_lang"]), 0)
+
+        requests = [
+            stats_upsert_request(user, slot, source_lang, target_lang, count=count)
+            for (user, slot, source_lang, target_lang), count in counts.items()
+        ]
+        for start in range(0, len(requests), BACKFILL_BATCH_SIZE):
+            await pocketbase.batch(requests[start:start + BACKFILL_BATCH_SIZE], "")
+
+    return len(requests)
+
+
+if __name__ == "__main__":
+    # python -m services.stats_rollup [user_id]
+    written = asyncio.run(backfill(sys.argv[1] if len(sys.argv) > 1 else None))
+    print(f"Backfilled {written} stats rollup rows")
@@ -0,0 +1,109 @@
+"""
+Translation result cache.
+Learners translate the same phrases repeatedly, so Papago results are kept
+keyed by normalized text and language pair: in a per-process LRU, backed
+by a SQLite file shared by every worker on the host and kept across
+restarts.
+"""
+import asyncio
+import sys
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from core.cache import TTLCache
+from core.config import settings
+from core.disk_cache import SQLiteCache
+
+_KEY_SEPARATOR = "\x1f"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups: Unicode NFC with collapsed whitespace."""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+
+def cache_key(text: str, source_lang: str, target_lang: str) -> tuple[str, str, str]:
+    return normalize_text(text), source_lang, target_lang
+
+
+def _entry_size(key: tuple[str, str, str], value: str) -> int:
+    return sys.getsizeof(key[0]) + sys.getsizeof(value)
+
+
+def _disk_key(key: tuple[str, str, str]) -> str:
+    text, source_lang, target_lang = key
+    return _KEY_SEPARATOR.join((source_lang, target_lang, text))
+
+
+class TranslationCache:
+    def __init__(self):
+        self.memory = TTLCache(
+            max_size=settings.TRANSLATION_CACHE_MAX_ENTRIES,
+            ttl=settings.TRANSLATION_CACHE_TTL_SECONDS,
+            max_bytes=settings.TRANSLATION_CACHE_MAX_BYTES,
+            sizeof=_entry_size
+        )
+        self.disk: Optional[SQLiteCache] = None
+        if settings.TRANSLATION_CACHE_DB_PATH:
+            self.disk = SQLiteCache(
+                settings.TRANSLATION_CACHE_DB_PATH,
+                ttl=settings.TRANSLATION_CACHE_TTL_SECONDS,
+                max_entries=settings.TRANSLATION_CACHE_DB_MAX_ENTRIES
+            )
+
+    async def get(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Return a cached translation, or None."""
+        key = cache_key(text, source_lang, target_lang)
+        value = self.memory.get(key)
+        if value is None and self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get_entry, _disk_key(key))
+            if entry is not None:
+                value, ttl = entry
+                self.memory.set(key, value, ttl=ttl)
+        return value
+
+    async def set(self, text: str, source_lang: str, target_lang: str, translated: str) -> None:
+        """Cache a successful translation in both tiers."""
+        key = cache_key(text, source_lang, target_lang)
+        self.memory.set(key, translated)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, _disk_key(key), translated)
+
+    async def warm(self) -> int:
+        """Load the most recent shared entries into memory after a restart."""
+        if self.disk is None or settings.TRANSLATION_CACHE_WARM_ENTRIES <= 0:
+            return 0
+        entries = await asyncio.to_thread(self.disk.recent, settings.TRANSLATION_CACHE_WARM_ENTRIES)
+        # Oldest first, so the newest entries end up most recently used
+        for disk_key, value, ttl in reversed(entries):
+            source_lang, target_lang, text = disk_key.split(_KEY_SEPARATOR, 2)
+            self.memory.set((text, source_lang, target_lang), value, ttl=ttl)
+        return len(entries)
+
+    def recent(self, limit: int) -> List[Tuple[str, str, str, str]]:
+        """
+        Return up to `limit` shared entries, newest first, as
+        `(text, source_lang, target_lang, translated)`. Blocking.
+        """
+        if self.disk is None:
+            return []
+        entries = []
+        for disk_key, value, _ in self.disk.recent(limit):
+            source_lang, target_lang, text = disk_key.split(_KEY_SEPARATOR, 2)
+            entries.append((text, source_lang, target_lang, value))
+        return entries
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Return cache counters per tier."""
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+# Singleton instance
+translation_cache = TranslationCache()
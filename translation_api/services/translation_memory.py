@@ -0,0 +1,191 @@
+"""
+Translation memory.
+Fuzzy lookup of earlier translations, so inputs that differ from a stored
+one only by punctuation, a particle or a word reuse its translation
+instead of calling Papago. Texts are compared by the Jaccard similarity of
+their character n-grams; a MinHash signature split into LSH bands finds
+candidates without scanning the whole memory.
+
+The memory is shared by all users, so it only holds translations a
+provider produced: the translator adds them as it caches them, and
+startup loads them from the shared translation cache, never from the
+texts users save.
+"""
+import asyncio
+import re
+import zlib
+from collections import OrderedDict, defaultdict
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+from core.config import settings
+from services.translation_cache import normalize_text, translation_cache
+
+# Mersenne prime for the MinHash permutations (a * x + b) mod p
+_PRIME = (1 << 61) - 1
+# Longer texts are signed on a worker thread instead of the event loop
+INLINE_LOOKUP_CHARS = 100
+_PUNCTUATION = re.compile(r"[^\w\s]+")
+
+Key = Tuple[str, str, str]
+
+
+class MemoryMatch(NamedTuple):
+    translated_text: str
+    score: float  # Jaccard similarity of the n-gram sets, 1.0 for a match up to punctuation
+
+
+def match_text(text: str) -> str:
+    """Normalize text for matching: no punctuation, case or extra spaces."""
+    return normalize_text(_PUNCTUATION.sub(" ", text)).lower()
+
+
+class TranslationMemory:
+    def __init__(self, threshold: float, max_entries: int, ngram: int = 2,
+                 num_perm: int = 64, bands: int = 16,
+                 max_text_chars: int = settings.TRANSLATION_MEMORY_MAX_TEXT_CHARS):
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_text_chars = max_text_chars
+        self.ngram = ngram
+        self.bands = bands
+        self.rows = num_perm // bands
+        # Fixed coefficients keep signatures stable across workers and restarts
+        self._perms = [
+            (zlib.crc32(f"a{i}".encode()) | 1, zlib.crc32(f"b{i}".encode()))
+            for i in range(num_perm)
+        ]
+        self._entries: "OrderedDict[Key, Tuple[FrozenSet[str], Tuple[int, ...], str]]" = OrderedDict()
+        self._buckets: Dict[tuple, Set[Key]] = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _shingles(self, text: str) -> FrozenSet[str]:
+        if len(text) <= self.ngram:
+            return frozenset([text])
+        return frozenset(text[i:i + self.ngram] for i in range(len(text) - self.ngram + 1))
+
+    def _signature(self, shingles: FrozenSet[str]) -> Tuple[int, ...]:
+        hashes = [zlib.crc32(s.encode()) for s in shingles]
+        return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in self._perms)
+
+    def _band_keys(self, source_lang: str, target_lang: str,
+                   signature: Tuple[int, ...]) -> List[tuple]:
+        return [
+            (source_lang, target_lang, band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def _matchable(self, text: str) -> str:
+        """Normalized `text`, or "" if it is empty or too long to sign."""
+        normalized = match_text(text)
+        return normalized if len(normalized) <= self.max_text_chars else ""
+
+    def add(self, text: str, translated: str, source_lang: str, target_lang: str) -> None:
+        """Add or refresh a translation, evicting the oldest beyond `max_entries`."""
+        normalized = self._matchable(text)
+        if not normalized or self.max_entries <= 0:
+            return
+        shingles = self._shingles(normalized)
+        self._put((source_lang, target_lang, normalized), shingles, self._signature(shingles), translated)
+
+    def _put(self, key: Key, shingles: FrozenSet[str], signature: Tuple[int, ...], translated: str) -> None:
+        self._remove(key)
+        self._entries[key] = (shingles, signature, translated)
+        for band_key in self._band_keys(key[0], key[1], signature):
+            self._buckets[band_key].add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def lookup(self, text: str, source_lang: str, target_lang: str) -> Optional[MemoryMatch]:
+        """Return the most similar stored translation at or above the threshold."""
+        normalized = self._matchable(text)
+        if not normalized:
+            return None
+        shingles = self._shingles(normalized)
+        return self._best(normalized, source_lang, target_lang, shingles, self._signature(shingles))
+
+    async def lookup_async(self, text: str, source_lang: str,
+                           target_lang: str) -> Optional[MemoryMatch]:
+        """`lookup` that computes the signature of long texts on a worker thread."""
+        normalized = self._matchable(text)
+        if not normalized:
+            return None
+        shingles = self._shingles(normalized)
+        if len(normalized) > INLINE_LOOKUP_CHARS:
+            signature = await asyncio.to_thread(self._signature, shingles)
+        else:
+            signature = self._signature(shingles)
+        # The index itself is only read and written on the event loop
+        return self._best(normalized, source_lang, target_lang, shingles, signature)
+
+    def _best(self, normalized: str, source_lang: str, target_lang: str,
+              shingles: FrozenSet[str], signature: Tuple[int, ...]) -> Optional[MemoryMatch]:
+        entry = self._entries.get((source_lang, target_lang, normalized))
+        if entry is not None:
+            self.hits += 1
+            return MemoryMatch(entry[2], 1.0)
+
+        candidates: Set[Key] = set()
+        for band_key in self._band_keys(source_lang, target_lang, signature):
+            candidates |= self._buckets.get(band_key, set())
+
+        best: Optional[MemoryMatch] = None
+        for key in candidates:
+            stored, _, translated = self._entries[key]
+            score = len(shingles & stored) / len(shingles | stored)
+            if score >= self.threshold and (best is None or score > best.score):
+                best = MemoryMatch(translated, score)
+        if best is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return best
+
+    async def load(self) -> int:
+        """
+        Index the most recent translations of the shared translation cache,
+        at most TRANSLATION_MEMORY_LOAD_ENTRIES. The index is built on a
+        worker thread and swapped in when done, so this can run in the
+        background after startup; until then only translations added since
+        are found.
+        """
+        limit = min(self.max_entries, settings.TRANSLATION_MEMORY_LOAD_ENTRIES)
+        if translation_cache.disk is None or limit <= 0:
+            return 0
+        index = await asyncio.get_running_loop().run_in_executor(None, self._build_index, limit)
+        # Translations added while loading are newer than anything loaded
+        for key, (shingles, signature, translated) in self._entries.items():
+            index._put(key, shingles, signature, translated)
+        self._entries, self._buckets = index._entries, index._buckets
+        return len(self._entries)
+
+    def _build_index(self, limit: int) -> "TranslationMemory":
+        index = TranslationMemory(self.threshold, self.max_entries, self.ngram,
+                                  len(self._perms), self.bands, self.max_text_chars)
+        # Oldest first, so the newest end up least likely to be evicted
+        for text, source_lang, target_lang, translated in reversed(translation_cache.recent(limit)):
+            index.add(text, translated, source_lang, target_lang)
+        return index
+
+    def _remove(self, key: Key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for band_key in self._band_keys(key[0], key[1], entry[1]):
+            bucket = self._buckets[band_key]
+            bucket.discard(key)
+            if not bucket:
+                del self._buckets[band_key]
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+# Singleton instance
+translation_memory = TranslationMemory(
+    settings.TRANSLATION_MEMORY_THRESHOLD,
+    settings.TRANSLATION_MEMORY_MAX_ENTRIES
+)
@@ -0,0 +1,262 @@
+"""
+Translation providers.
+Papago and an offline dictionary behind one interface, with per-provider
+health tracking, circuit breaking, failover and optional hedged requests.
+"""
+import asyncio
+import json
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, Optional
+
+from core.config import settings
+from services.papago import PapagoError, papago
+from services.papago_quota import QuotaExceededError, papago_quota
+from services.translation_cache import normalize_text
+
+
+class ProviderError(Exception):
+    """No provider could translate the text."""
+    status_code = 503
+
+
+class ProviderMiss(ProviderError):
+    """The provider works but has no translation for this text; try the next one."""
+
+
+def is_client_error(error: Exception) -> bool:
+    """Errors caused by the request itself; other providers won't do better."""
+    status_code = getattr(error, "status_code", None)
+    return isinstance(error, PapagoError) and status_code < 500 and status_code != 429
+
+
+class ProviderHealth:
+    """Rolling latency and failure stats with a simple circuit breaker."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, window: int = 200):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.latencies: deque = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False  # A half-open trial call is in flight
+
+    def available(self) -> bool:
+        """Closed, or open long enough that a trial call is allowed (half-open)."""
+        if not self.open_until:
+            return True
+        return time.monotonic() >= self.open_until and not self.probing
+
+    def begin_call(self) -> Optional[bool]:
+        """
+        Claim a call: None if the circuit rejects it, otherwise whether it
+        is the single half-open trial call, which the caller must end with
+        `end_probe()`.
+        """
+        if not self.available():
+            return None
+        if self.open_until:
+            self.probing = True
+            return True
+        return False
+
+    def end_probe(self) -> None:
+        self.probing = False
+
+    def record_success(self, latency: float) -> None:
+        self.latencies.append(latency)
+        self.successes += 1
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self.consecutive_failures += 1
+        if self.consecutive_failures >= self.failure_threshold:
+            self.open_until = time.monotonic() + self.reset_seconds
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Latency at `percentile` (0-100) of recent successes, if any."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "available": self.available(),
+            "successes": self.successes,
+            "failures": self.failures,
+            "consecutive_failures": self.consecutive_failures,
+            "p50_latency": self.latency_percentile(50),
+            "p95_latency": self.latency_percentile(95),
+        }
+
+
+class TranslationProvider(ABC):
+    name = "provider"
+
+    def __init__(self):
+        self.health = ProviderHealth(
+            settings.TRANSLATION_CIRCUIT_FAILURE_THRESHOLD,
+            settings.TRANSLATION_CIRCUIT_RESET_SECONDS
+        )
+
+    @abstractmethod
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        """Translate text or raise; ProviderMiss passes the text to the next provider."""
+
+
+class PapagoProvider(TranslationProvider):
+    name = "papago"
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        await papago_quota.acquire(len(text))
+        return await papago.translate(text, source_lang, target_lang)
+
+
+class DictionaryProvider(TranslationProvider):
+    """
+    Offline provider backed by a JSON phrase dictionary.
+
+    The file maps "source-target" pairs to phrase tables, e.g.
+    `{"ko-en": {"안녕하세요": "Hello"}}`. Useful for tests and as a
+    last-resort fallback for common phrases.
+    """
+    name = "dictionary"
+
+    def __init__(self, entries: Optional[Dict[str, Dict[str, str]]] = None, path: str = ""):
+        super().__init__()
+        if entries is None and path:
+            with open(path, encoding="utf-8") as f:
+                entries = json.load(f)
+        self.entries = {
+            pair: {normalize_text(text): translated for text, translated in phrases.items()}
+            for pair, phrases in (entries or {}).items()
+        }
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        phrases = self.entries.get(f"{source_lang}-{target_lang}", {})
+        translated = phrases.get(normalize_text(text))
+        if translated is None:
+            raise ProviderMiss(f"No dictionary entry for {source_lang}-{target_lang} text")
+        return translated
+
+
+class ProviderChain:
+    """
+    Try providers in order, skipping ones whose circuit is open.
+
+    With hedging on, a request to the first provider that hasn't answered
+    within its recent latency percentile is raced against the second.
+    """
+
+    def __init__(self, providers: List[TranslationProvider], hedge: bool = False,
+                 hedge_percentile: float = 95.0, hedge_min_samples: int = 20):
+        self.providers = providers
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedges = 0
+
+    async def translate(self, text: str, source_lang: str, target_lang: str) -> str:
+        available = [p for p in self.providers if p.health.available()]
+        if not available:
+            raise ProviderError("No translation provider is available")
+
+        errors: List[Exception] = []
+        if (self.hedge and len(available) > 1
+                and len(available[0].health.latencies) >= self.hedge_min_samples):
+            try:
+                return await self._hedged(available[0], available[1], text, source_lang, target_lang)
+            except Exception as e:
+                if is_client_error(e):
+                    raise
+                errors.append(e)
+                available = available[2:]
+
+        for provider in available:
+            try:
+                return await self._call(provider, text, source_lang, target_lang)
+            except Exception as e:
+                if is_client_error(e):
+                    raise
+                errors.append(e)
+        raise errors[-1]
+
+    async def _call(self, provider: TranslationProvider, text: str,
+                    source_lang: str, target_lang: str) -> str:
+        probe = provider.health.begin_call()
+        if probe is None:
+            # Another caller is already making the half-open trial call
+            raise ProviderError(f"Translation provider {provider.name} is unavailable")
+        started = time.monotonic()
+        try:
+            translated = await provider.translate(text, source_lang, target_lang)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Misses and running out of quota say nothing about the provider's health
+            if not (is_client_error(e) or isinstance(e, (ProviderMiss, QuotaExceededError))):
+                provider.health.record_failure()
+            raise
+        finally:
+            if probe:
+                provider.health.end_probe()
+        provider.health.record_success(time.monotonic() - started)
+        return translated
+
+    async def _hedged(self, primary: TranslationProvider, secondary: TranslationProvider,
+                      text: str, source_lang: str, target_lang: str) -> str:
+        delay = primary.health.latency_percentile(self.hedge_percentile)
+        first = asyncio.ensure_future(self._call(primary, text, source_lang, target_lang))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        if done and first.exception() is None:
+            return first.result()
+        if done and is_client_error(first.exception()):
+            raise first.exception()
+
+        self.hedges += 1
+        tasks = {asyncio.ensure_future(self._call(secondary, text, source_lang, target_lang))}
+        if not done:
+            tasks.add(first)
+        error: Optional[BaseException] = first.exception() if done else None
+        try:
+            while tasks:
+                finished, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "hedges": self.hedges,
+            "providers": {p.name: p.health.stats() for p in self.providers},
+        }
+
+
+def build_providers() -> ProviderChain:
+    """Build the provider chain configured by TRANSLATION_PROVIDERS."""
+    factories = {
+        "papago": PapagoProvider,
+        "dictionary": lambda: DictionaryProvider(path=settings.TRANSLATION_DICTIONARY_PATH),
+    }
+    return ProviderChain(
+        [factories[name]() for name in settings.TRANSLATION_PROVIDERS],
+        hedge=settings.TRANSLATION_HEDGE_ENABLED,
+        hedge_percentile=settings.TRANSLATION_HEDGE_PERCENTILE,
+        hedge_min_samples=settings.TRANSLATION_HEDGE_MIN_SAMPLES
+    )
+
+
+# Singleton instance
+translation_providers = build_providers()
@@ -0,0 +1,208 @@
+"""
+Translation service.
+Single entry point for translating text: serves cached results and only
+calls the translation providers on a miss, sharing one upstream call
+between concurrent identical requests.
+"""
+import asyncio
+import re
+from collections import deque
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from core.config import settings
+from core.singleflight import SingleFlight
+from services.papago_quota import bulk_priority
+from services.translation_cache import cache_key, normalize_text, translation_cache
+from services.translation_memory import translation_memory
+from services.translation_providers import translation_providers
+
+# Packed texts are joined with newlines, which Papago keeps line for line
+PACK_SEPARATOR = "\n"
+
+# A sentence runs to terminal punctuation followed by whitespace, or to the
+# end of its line; group 2 is the whitespace that follows it
+_SENTENCE_PATTERN = re.compile(r'(\S[^\n]*?(?:[.!?。！？…]+(?=\s|$)|(?=\n)|$))(\s*)')
+
+
+class Segment(NamedTuple):
+    text: str
+    separator: str  # Original whitespace after the segment
+
+
+# Concurrent misses for the same cache key share one upstream call
+papago_flight = SingleFlight()
+
+
+async def translate(text: str, source_lang: str, target_lang: str) -> str:
+    """Translate text, using the result cache in front of the providers."""
+    cached = await translation_cache.get(text, source_lang, target_lang)
+    if cached is not None:
+        return cached
+    return await _translate_uncached(text, source_lang, target_lang)
+
+
+async def translate_with_memory(text: str, source_lang: str,
+                                target_lang: str) -> Tuple[str, Optional[float]]:
+    """
+    Translate text, trying the exact result cache, then the fuzzy
+    translation memory, then the providers. Returns the translation and
+    the similarity score of a memory match, or None if it wasn't one.
+    """
+    cached = await translation_cache.get(text, source_lang, target_lang)
+    if cached is not None:
+        return cached, None
+    match = await translation_memory.lookup_async(text, source_lang, target_lang)
+    if match is not None:
+        return match.translated_text, match.score
+    return await _translate_uncached(text, source_lang, target_lang), None
+
+
+async def _translate_uncached(text: str, source_lang: str, target_lang: str) -> str:
+    async def fetch() -> str:
+        # Provider errors propagate, so failed translations are never cached
+        translated = await translation_providers.translate(text, source_lang, target_lang)
+        await translation_cache.set(text, source_lang, target_lang, translated)
+        translation_memory.add(text, translated, source_lang, target_lang)
+        return translated
+
+    return await papago_flight.do(cache_key(text, source_lang, target_lang), fetch)
+
+
+def pack_texts(texts: List[str], max_chars: int) -> List[List[str]]:
+    """
+    Greedily group texts into packs whose newline-joined length fits
+    `max_chars`. Texts must not contain newlines themselves.
+    """
+    packs: List[List[str]] = []
+    current: List[str] = []
+    length = 0
+    for text in texts:
+        added = len(text) + (len(PACK_SEPARATOR) if current else 0)
+        if current and length + added > max_chars:
+            packs.append(current)
+            current, length = [], 0
+            added = len(text)
+        current.append(text)
+        length += added
+    if current:
+        packs.append(current)
+    return packs
+
+
+async def translate_many(texts: List[str], source_lang: str,
+                         target_lang: str) -> List[Union[str, Exception]]:
+    """
+    Translate many texts with as few Papago requests as possible.
+
+    Texts are normalized and deduplicated, cache hits are served directly,
+    and the misses are packed into newline-joined requests up to Papago's
+    character limit and sent with bounded concurrency at bulk quota
+    priority. Returns one translation or exception per input text, in
+    input order.
+    """
+    unique = list(dict.fromkeys(normalize_text(text) for text in texts))
+    results: Dict[str, Union[str, Exception]] = {}
+
+    misses = []
+    for text in unique:
+        if not text:
+            results[text] = ""
+        elif len(text) > settings.PAPAGO_MAX_CHARS:
+            results[text] = ValueError(
+                f"Text exceeds Papago's {settings.PAPAGO_MAX_CHARS} character limit"
+            )
+        else:
+            cached = await translation_cache.get(text, source_lang, target_lang)
+            if cached is None:
+                misses.append(text)
+            else:
+                results[text] = cached
+
+    semaphore = asyncio.Semaphore(settings.TRANSLATION_BATCH_CONCURRENCY)
+
+    async def translate_one(text: str) -> None:
+        try:
+            results[text] = await translate(text, source_lang, target_lang)
+        except Exception as e:
+            results[text] = e
+
+    async def translate_pack(pack: List[str]) -> None:
+        async with semaphore:
+            if len(pack) == 1:
+                await translate_one(pack[0])
+                return
+            try:
+                joined = await translation_providers.translate(
+                    PACK_SEPARATOR.join(pack), source_lang, target_lang
+                )
+                lines = joined.split(PACK_SEPARATOR)
+            except Exception:
+                lines = []
+            if len(lines) != len(pack):
+                # The provider merged or split lines, or the pack failed as a whole:
+                # fall back to one request per text for this pack
+                await asyncio.gather(*(translate_one(text) for text in pack))
+                return
+            for text, translated in zip(pack, lines):
+                results[text] = translated.strip()
+                await translation_cache.set(text, source_lang, target_lang, results[text])
+                translation_memory.add(text, results[text], source_lang, target_lang)
+
+    with bulk_priority():
+        await asyncio.gather(*(
+            translate_pack(pack) for pack in pack_texts(misses, settings.PAPAGO_MAX_CHARS)
+        ))
+    return [results[normalize_text(text)] for text in texts]
+
+
+def split_sentences(text: str, max_chars: int) -> List[Segment]:
+    """
+    Split text into sentence segments of at most `max_chars` characters.
+
+    Overlong sentences are cut at the last space before the limit.
+    Joining `text + separator` of all segments reproduces the input
+    without leading whitespace.
+    """
+    segments = []
+    for match in _SENTENCE_PATTERN.finditer(text):
+        sentence, separator = match.groups()
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            segments.append(Segment(sentence[:cut].rstrip(), " "))
+            sentence = sentence[cut:].lstrip()
+        segments.append(Segment(sentence, separator))
+    return segments
+
+
+async def translate_stream(text: str, source_lang: str, target_lang: str,
+                           window: int) -> AsyncIterator[tuple[int, Segment, Union[str, Exception]]]:
+    """
+    Translate a long text sentence by sentence, yielding results in order.
+
+    Up to `window` segments are translated concurrently. Each result is
+    yielded as soon as it and every earlier segment are done, so the first
+    sentence arrives after one segment's latency and memory stays bounded
+    by the window.
+    """
+    async def run(segment: Segment) -> Union[str, Exception]:
+        try:
+            return await translate(segment.text, source_lang, target_lang)
+        except Exception as e:
+            return e
+
+    pending: deque = deque()
+    try:
+        for index, segment in enumerate(split_sentences(text, settings.PAPAGO_MAX_CHARS)):
+            pending.append((index, segment, asyncio.ensure_future(run(segment))))
+            if len(pending) >= window:
+                index, segment, task = pending.popleft()
+                yield index, segment, await task
+        while pending:
+            index, segment, task = pending.popleft()
+            yield index, segment, await task
+    finally:
+        # The client disconnected: stop translating the rest
+        for _, _, task in pending:
+            task.cancel()
@@ -90,3 +90,29 @@ async def test_get_current_user():
         assert data["email"] == "currentuser@test.com"
         assert data["display_name"] == "Current User"
 
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_cache(monkeypatch):
+    """Test that a valid JWT is served from the user cache after one fetch."""
+    from core.pocketbase_client import pocketbase
+    from core.security import create_access_token
+    from routers.auth import get_current_user, invalidate_cached_user
+
+    calls = []
+
+    async def fake_get_user(user_id, token):
+        calls.append(user_id)
+        return {"id": user_id, "email": "cached@test.com"}
+
+    monkeypatch.setattr(pocketbase, "get_user", fake_get_user)
+    token = create_access_token(data={"sub": "user123", "pb_token": "pb-token"})
+
+    first = await get_current_user(token)
+    second = await get_current_user(token)
+    assert first == second
+    assert second["token"] == "pb-token"
+    assert calls == ["user123"]
+
+    invalidate_cached_user("user123")
+    await get_current_user(token)
+    assert calls == ["user123", "user123"]
@@ -0,0 +1,47 @@
+"""
+Unit tests for the background job queue.
+Run with: pytest
+"""
+import asyncio
+
+import pytest
+
+from core.background_queue import BackgroundQueue
+
+
+@pytest.mark.asyncio
+async def test_failed_jobs_are_retried():
+    """Test that a job failing transiently is retried until it succeeds."""
+    queue = BackgroundQueue(max_size=10, workers=1, max_retries=3, backoff=0.001)
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("PocketBase unavailable")
+
+    assert queue.submit(flaky)
+    await queue.drain(timeout=1.0)
+    assert len(attempts) == 3
+    assert queue.stats()["completed"] == 1
+    assert queue.stats()["retried"] == 2
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_and_drain_finishes_jobs():
+    """Test backpressure on a full queue and drain-on-shutdown."""
+    queue = BackgroundQueue(max_size=2, workers=1, max_retries=0, backoff=0)
+    done = []
+
+    def job(n):
+        async def run():
+            await asyncio.sleep(0.01)
+            done.append(n)
+        return run
+
+    accepted = [queue.submit(job(n)) for n in range(4)]
+    assert accepted == [True, True, False, False]
+
+    await queue.drain(timeout=1.0)
+    assert done == [0, 1]
+    assert queue.stats()["rejected"] == 2
@@ -0,0 +1,77 @@
+"""
+Unit tests for the in-memory caches.
+Run with: pytest
+"""
+import time
+
+from core.cache import TTLCache
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """Test that the oldest untouched entry is evicted when full."""
+    cache = TTLCache(max_size=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    """Test that entries are not served past their TTL."""
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = TTLCache(max_size=10, ttl=5)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    now[0] += 6
+    assert cache.get("a") is None
+    assert cache.stats() == {"size": 0, "bytes": 0, "hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_ttl_cache_evicts_by_size():
+    """Test that the byte budget evicts old entries and rejects oversized ones."""
+    cache = TTLCache(max_size=100, ttl=60, max_bytes=10, sizeof=lambda key, value: len(value))
+    cache.set("a", "xxxx")
+    cache.set("b", "yyyy")
+    cache.set("c", "zzzz")
+
+    assert cache.get("a") is None
+    assert cache.bytes == 8
+    cache.set("d", "x" * 11)
+    assert cache.get("d") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_cache_is_shared_between_processes(tmp_path):
+    """Test that a second opener (another worker) sees entries and TTLs."""
+    from core.disk_cache import SQLiteCache
+
+    path = str(tmp_path / "cache.sqlite3")
+    worker_a = SQLiteCache(path, ttl=60, max_entries=100)
+    worker_b = SQLiteCache(path, ttl=60, max_entries=100)
+    worker_a.set("k", "v")
+    worker_a.set("gone", "v", ttl=-1)
+
+    assert worker_b.get("k") == "v"
+    assert worker_b.get("gone") is None
+    assert [key for key, _, _ in worker_b.recent(10)] == ["k"]
+    worker_a.close()
+    worker_b.close()
+
+
+def test_sqlite_cache_prunes_to_max_entries(tmp_path):
+    """Test that the oldest entries are pruned past the entry cap."""
+    from core.disk_cache import SQLiteCache
+
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=3, prune_interval=5)
+    for i in range(5):
+        cache.set(f"k{i}", "v", ttl=60 + i)
+
+    assert [key for key, _, _ in cache.recent(10)] == ["k4", "k3", "k2"]
+    cache.close()
@@ -0,0 +1,25 @@
+"""
+Unit tests for the extraction backend benchmark.
+Run with: pytest
+"""
+from services.extractor_benchmark import agreement, compare
+
+
+def test_agreement_per_category():
+    """Test Jaccard agreement, with verbs/adjectives skipped for predicate-only tags."""
+    okt = [[("학교", "Noun"), ("가다", "Verb"), ("좋다", "Adjective")]]
+    kiwi = [[("학교", "Noun"), ("가다", "Verb"), ("좋다", "Verb")]]
+    hangul = [[("학교", "Noun"), ("가다", "Predicate")]]
+
+    assert agreement(kiwi, okt) == {"nouns": 1.0, "verbs": 0.5, "adjectives": 0.0, "predicates": 1.0}
+    assert agreement(hangul, okt) == {"nouns": 1.0, "verbs": None, "adjectives": None, "predicates": 0.5}
+
+
+def test_compare_reports_every_installed_backend():
+    """Test that the harness measures speed, memory and agreement per backend."""
+    results = compare(rounds=1)
+    assert results["hangul"]["f1"] > 0.9
+    assert results["hangul"]["rss_mb"] > 0
+    assert results["hangul"]["sentences_per_second"] > 0
+    assert "nouns" in results["hangul"]
+    assert results["legacy_regex"]["f1"] < results["hangul"]["f1"]
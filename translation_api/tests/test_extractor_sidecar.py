@@ -0,0 +1,89 @@
+"""
+Unit tests for the Korean extractor sidecar and its client.
+Run with: pytest
+"""
+import asyncio
+import time
+
+import pytest
+
+from core.config import settings
+from services.extractor_client import ExtractorClient
+from services.extractor_sidecar import ExtractorSidecar
+from services.korean_extractor import KoreanExtractor
+from tests.test_korean_extractor import SlowAnalyzer
+
+
+class BatchAnalyzer(SlowAnalyzer):
+    """Records the size of every analyzer call."""
+
+    def __init__(self, delay=0.0):
+        super().__init__(delay)
+        self.batches = []
+
+    def pos_batch(self, texts):
+        self.batches.append(len(texts))
+        time.sleep(self.delay)
+        return [[("학교", "Noun"), ("가다", "Verb"), ("단어" + text[-1], "Noun")] for text in texts]
+
+
+async def start_sidecar(tmp_path, delay=0.0, **options):
+    extractor = KoreanExtractor()
+    extractor.analyzer = BatchAnalyzer(delay)
+    sidecar = ExtractorSidecar(str(tmp_path / "extractor.sock"), extractor, **options)
+    await sidecar.start()
+    return sidecar
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_micro_batched(tmp_path):
+    """Test that concurrent requests share analyzer calls and get their own words."""
+    sidecar = await start_sidecar(tmp_path, delay=0.05, max_batch=16, max_delay=0.01, workers=1)
+    client = ExtractorClient(sidecar.path, timeout=2.0)
+
+    texts = [f"학교에 가요 {i}" for i in range(40)]
+    results = await asyncio.gather(*(client.extract_words(text, min_length=3) for text in texts))
+
+    assert [sorted(words) for words in results] == [[f"단어{i % 10}"] for i in range(40)]
+    batches = sidecar.extractor.analyzer.batches
+    assert sum(batches) == 40 and len(batches) < 10
+    assert max(batches) <= 16
+    assert client.stats()["fallbacks"] == 0
+    assert sidecar.stats()["batches"] == len(batches)
+
+    client.close()
+    await sidecar.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_or_missing_sidecar_falls_back(tmp_path):
+    """Test the JVM-free fallback on timeouts and when nothing is listening."""
+    sidecar = await start_sidecar(tmp_path, delay=0.3)
+    client = ExtractorClient(sidecar.path, timeout=0.05)
+    assert sorted(await client.extract_words("학교에 가요")) == ["가다", "학교"]
+    assert client.stats()["timeouts"] == 1
+    client.close()
+    await sidecar.close()
+
+    missing = ExtractorClient(str(tmp_path / "missing.sock"), timeout=1.0, retry_after=60)
+    assert sorted(await missing.extract_words("학교에 가요")) == ["가다", "학교"]
+    assert sorted(await missing.extract_words("학교에 가요")) == ["가다", "학교"]
+    assert missing.stats()["errors"] == 2 and missing.stats()["fallbacks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_extractor_uses_the_sidecar_without_an_analyzer(tmp_path, monkeypatch):
+    """Test that a configured sidecar answers async extraction and nothing is started locally."""
+    sidecar = await start_sidecar(tmp_path)
+    monkeypatch.setattr(settings, "KOREAN_EXTRACTOR_SIDECAR_SOCKET", sidecar.path)
+
+    extractor = KoreanExtractor()
+    await extractor.warmup_async()
+    words = await extractor.extract_words_async("학교에 가요 7")
+
+    assert sorted(words) == ["가다", "단어7", "학교"]
+    assert extractor._analyzer is None
+    assert extractor.stats()["sidecar"]["requests"] == 1
+
+    extractor.close()
+    await sidecar.close()
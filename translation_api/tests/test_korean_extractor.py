@@ -0,0 +1,123 @@
+"""
+Unit tests for the Korean word extractor.
+Run with: pytest
+"""
+import asyncio
+import time
+
+import pytest
+
+from core.config import settings
+from services.analyzers import AnalyzerBackend
+from services.korean_extractor import KoreanExtractor
+
+
+class SlowAnalyzer(AnalyzerBackend):
+    """Stand-in analyzer whose analysis blocks like a JVM call."""
+    name = "slow"
+    available = True
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+
+    def pos(self, text):
+        time.sleep(self.delay)
+        return [("학교", "Noun"), ("가다", "Verb"), ("에", "Josa")]
+
+
+def make_extractor(delay):
+    extractor = KoreanExtractor()
+    extractor.analyzer = SlowAnalyzer(delay)
+    return extractor
+
+
+@pytest.mark.asyncio
+async def test_async_extraction_does_not_block_the_loop():
+    """Test that analysis runs off the event loop."""
+    extractor = make_extractor(0.2)
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.02)
+
+    words, _ = await asyncio.gather(extractor.extract_words_async("학교에 가요"), ticker())
+    assert sorted(words) == ["가다", "학교"]
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+    extractor.close()
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_overflow_fall_back(monkeypatch):
+    """Test the JVM-free fallback for slow analyses and a full queue."""
+    monkeypatch.setattr(settings, "KOREAN_EXTRACTOR_TIMEOUT", 0.05)
+    monkeypatch.setattr(settings, "KOREAN_EXTRACTOR_WORKERS", 1)
+    monkeypatch.setattr(settings, "KOREAN_EXTRACTOR_MAX_PENDING", 1)
+    extractor = make_extractor(0.3)
+
+    slow, full = await asyncio.gather(
+        extractor.extract_words_async("학교에 가요"),
+        extractor.extract_words_async("학교에 가요")
+    )
+    assert sorted(slow) == sorted(full) == ["가다", "학교"]
+    assert extractor.stats()["timeouts"] == 1
+    assert extractor.stats()["overflows"] == 1
+    extractor.close()
+
+
+@pytest.mark.asyncio
+async def test_analyzer_is_created_lazily_and_warmed_up(monkeypatch):
+    """Test that construction doesn't start the analyzer and warmup analyzes once."""
+    from services import analyzers
+
+    created = []
+
+    class FakeBackend(SlowAnalyzer):
+        def __init__(self):
+            super().__init__()
+            created.append(self)
+            self.calls = []
+
+        def pos(self, text):
+            self.calls.append(text)
+            return super().pos(text)
+
+    monkeypatch.setitem(analyzers.BACKENDS, "fake", FakeBackend)
+    monkeypatch.setattr(settings, "KOREAN_ANALYZER_BACKEND", "fake")
+
+    extractor = KoreanExtractor()
+    assert created == [] and extractor.available
+
+    await extractor.warmup_async()
+    assert len(created) == 1
+    assert created[0].calls == [analyzers.WARMUP_SENTENCE]
+    assert sorted(await extractor.extract_words_async("학교에 가요")) == ["가다", "학교"]
+    assert len(created) == 1
+    extractor.close()
+
+
+def test_hangul_backend_uses_the_fallback(monkeypatch):
+    """Test that the pure-Python backend needs no analyzer."""
+    monkeypatch.setattr(settings, "KOREAN_ANALYZER_BACKEND", "hangul")
+    extractor = KoreanExtractor()
+    assert not extractor.available and extractor.analyzer is None
+    assert sorted(extractor.extract_words("학교에 가요")) == ["가다", "학교"]
+
+
+@pytest.mark.asyncio
+async def test_parallel_extraction_merges_chunks_progressively(monkeypatch):
+    """Test that pooled batch extraction yields each new word once with progress."""
+    monkeypatch.setattr(settings, "KOREAN_EXTRACTOR_PROCESSES", 2)
+    extractor = make_extractor(0)  # Forces the pool; workers build their own extractor
+    texts = [f"학교 공부 단어{i % 7}" for i in range(50)]
+
+    progress = [p async for p in extractor.extract_unique_words_parallel(texts, chunk_size=10)]
+    extractor.close()
+
+    assert len(progress) == 5
+    assert [p.texts_done for p in progress] == [10, 20, 30, 40, 50]
+    words = [word for p in progress for word in p.words]
+    assert sorted(words) == sorted(KoreanExtractor().extract_unique_words(texts))
+    assert len(words) == len(set(words))
+    assert progress[-1].texts_per_second > 0
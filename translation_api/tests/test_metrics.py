@@ -0,0 +1,43 @@
+"""
+Unit tests for the internal metrics endpoint.
+Run with: pytest
+"""
+import httpx
+import pytest
+
+from core.config import settings
+from core.token_bucket import SharedTokenBuckets
+from main import app
+from services.papago_quota import papago_quota
+
+
+@pytest.fixture(autouse=True)
+def in_memory_quota(monkeypatch):
+    monkeypatch.setattr(papago_quota, "buckets", SharedTokenBuckets(":memory:"))
+
+
+def make_client(host: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app, client=(host, 1234)), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_loopback_only_without_a_token(monkeypatch):
+    """Test that without METRICS_TOKEN only local clients get the counters."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    async with make_client("127.0.0.1") as local, make_client("203.0.113.7") as remote:
+        response = await local.get("/metrics")
+        assert response.status_code == 200
+        assert "papago_quota" in response.json()
+        assert (await remote.get("/metrics")).status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_metrics_token_is_required_when_set(monkeypatch):
+    """Test that a configured METRICS_TOKEN is checked for every client."""
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "s3cret")
+    async with make_client("127.0.0.1") as client:
+        assert (await client.get("/metrics")).status_code == 401
+        wrong = await client.get("/metrics", headers={"Authorization": "Bearer nope"})
+        assert wrong.status_code == 401
+        right = await client.get("/metrics", headers={"Authorization": "Bearer s3cret"})
+        assert right.status_code == 200
@@ -0,0 +1,42 @@
+"""
+Unit tests for the Papago client.
+Run with: pytest
+"""
+import httpx
+import pytest
+
+from services.papago import PapagoClient, PapagoError
+
+
+def make_client(handler) -> PapagoClient:
+    """Create a Papago client whose HTTP traffic goes to `handler`."""
+    papago = PapagoClient()
+    papago.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return papago
+
+
+@pytest.mark.asyncio
+async def test_translate_reuses_shared_client():
+    """Test that translations go through the one pooled client."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert b"text=%EC%95%88%EB%85%95" in request.content
+        return httpx.Response(200, json={"message": {"result": {"translatedText": "Hello"}}})
+
+    papago = make_client(handler)
+    client = papago.client
+    assert await papago.translate("안녕", "ko", "en") == "Hello"
+    assert await papago.translate("안녕", "ko", "en") == "Hello"
+    assert papago.client is client
+
+    await papago.close()
+    assert papago.client is None
+
+
+@pytest.mark.asyncio
+async def test_translate_raises_papago_error():
+    """Test that non-200 responses surface as PapagoError with the status."""
+    papago = make_client(lambda request: httpx.Response(429, text="quota exceeded"))
+    with pytest.raises(PapagoError) as exc_info:
+        await papago.translate("안녕", "ko", "en")
+    assert exc_info.value.status_code == 429
+    await papago.close()
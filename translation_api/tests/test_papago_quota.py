@@ -0,0 +1,78 @@
+"""
+Unit tests for the Papago quota manager.
+Run with: pytest
+"""
+import asyncio
+
+import pytest
+
+from core.token_bucket import SharedTokenBuckets
+from services.papago_quota import BULK, PapagoQuota, QuotaExceededError, bulk_priority, priority
+
+
+def make_quota(path=":memory:", daily_chars=0, calls_per_second=0.0, max_wait=1.0, reserve=0.0):
+    return PapagoQuota(SharedTokenBuckets(path), daily_chars, calls_per_second, max_wait, reserve)
+
+
+@pytest.mark.asyncio
+async def test_queues_briefly_for_call_rate():
+    """Test that calls over the per-second rate wait instead of failing."""
+    quota = make_quota(calls_per_second=20)
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    for _ in range(25):
+        await quota.acquire(1)
+
+    assert loop.time() - started >= 0.2
+    assert quota.throttled >= 1
+    assert quota.rejected == 0
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_daily_budget_is_spent():
+    """Test that an exhausted character budget fails fast."""
+    quota = make_quota(daily_chars=100)
+    await quota.acquire(90)
+    with pytest.raises(QuotaExceededError):
+        await quota.acquire(20)
+    assert quota.rejected == 1
+    assert quota.stats()["remaining_daily_chars"] == pytest.approx(10, abs=0.1)
+
+
+@pytest.mark.asyncio
+async def test_bulk_leaves_reserve_for_interactive():
+    """Test that bulk work can't spend the interactive reserve."""
+    quota = make_quota(daily_chars=100, reserve=0.5)
+    with bulk_priority():
+        assert priority.get() == BULK
+        await quota.acquire(40)
+        with pytest.raises(QuotaExceededError):
+            await quota.acquire(20)
+    await quota.acquire(50)
+
+
+@pytest.mark.asyncio
+async def test_budget_is_shared_between_workers(tmp_path):
+    """Test that two processes' managers meter one shared budget."""
+    path = str(tmp_path / "quota.sqlite3")
+    first, second = make_quota(path, daily_chars=100), make_quota(path, daily_chars=100)
+    await first.acquire(60)
+    with pytest.raises(QuotaExceededError):
+        await second.acquire(60)
+    first.close()
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_daily_budget_resets_on_the_next_day_only(monkeypatch):
+    """Test that spent characters don't refill within the day and reset on the next one."""
+    quota = make_quota(daily_chars=100, max_wait=0.1)
+    monkeypatch.setattr(quota, "_period", lambda: ("2024-05-01", 60.0))
+    await quota.acquire(100)
+    await asyncio.sleep(0.05)
+    with pytest.raises(QuotaExceededError):
+        await quota.acquire(1)
+
+    monkeypatch.setattr(quota, "_period", lambda: ("2024-05-02", 86400.0))
+    await quota.acquire(100)
+    assert quota.stats()["remaining_daily_chars"] == 0
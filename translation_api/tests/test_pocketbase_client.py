@@ -0,0 +1,211 @@
+"""
+Unit tests for the PocketBase client.
+Run with: pytest
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from jose import jwt
+
+from core.pocketbase_client import PocketBaseClient
+
+
+def make_token(expires_in: float) -> str:
+    """Build a PocketBase-like token expiring `expires_in` seconds from now."""
+    return jwt.encode({"exp": int(time.time() + expires_in)}, "secret", algorithm="HS256")
+
+
+def make_client(handler, admin_token: str = "") -> PocketBaseClient:
+    """Create a client whose HTTP traffic goes to `handler`, optionally holding a superuser token."""
+    pb = PocketBaseClient()
+    pb.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    if admin_token:
+        pb.admin_token, pb.admin_token_expires_at = admin_token, time.time() + 3600
+    return pb
+
+
+@pytest.mark.asyncio
+async def test_admin_token_is_cached():
+    """Test that the superuser token is reused while valid."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"token": make_token(3600)})
+
+    pb = make_client(handler)
+    first = await pb.authenticate_admin()
+    second = await pb.authenticate_admin()
+    headers = await pb._get_headers()
+
+    assert first == second
+    assert headers["Authorization"] == f"Bearer {first}"
+    assert len(calls) == 1
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_admin_auth_is_collapsed():
+    """Test that concurrent callers share one in-flight auth request."""
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.05)
+        return httpx.Response(200, json={"token": make_token(3600)})
+
+    pb = make_client(handler)
+    tokens = await asyncio.gather(*(pb.authenticate_admin() for _ in range(20)))
+
+    assert len(set(tokens)) == 1
+    assert len(calls) == 1
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_admin_token_refreshed_in_background_near_expiry():
+    """Test that a token inside the refresh margin is served while refreshing."""
+    tokens = [make_token(60), make_token(3600)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"token": tokens.pop(0)})
+
+    pb = make_client(handler)
+    stale = await pb.authenticate_admin()
+    served = await pb.authenticate_admin()
+    assert served == stale
+
+    await pb._admin_refresh
+    assert pb.admin_token != stale
+    assert pb.admin_token_expires_at > time.time() + 3000
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_save_translation_is_one_batch_request():
+    """Test that a translation save sends all of its writes as one batch."""
+    import json
+    from core.pocketbase_client import vocabulary_record_id
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=[
+            {"status": 200, "body": {"id": "t1", "source_text": "안녕"}},
+            {"status": 200, "body": {"id": "v1", "count": 1}},
+        ])
+
+    pb = make_client(handler, admin_token="admin-token")
+    result = await pb.save_translation("u1", "안녕", "hello", "ko", "en", token="user-token")
+
+    assert result["id"] == "t1"
+    assert [r.url.path for r in calls] == ["/api/batch"]
+    # Users may not write stats rollups themselves
+    assert calls[0].headers["Authorization"] == "Bearer admin-token"
+    requests = json.loads(calls[0].content)["requests"]
+    assert [r["method"] for r in requests] == ["POST", "PUT", "PUT", "PUT"]
+    stats = [r["body"] for r in requests if "translation_stats" in r["url"]]
+    assert [row["slot"] for row in stats][1] == ""
+    assert all(row["count+"] == 1 for row in stats)
+    assert requests[-1]["body"]["id"] == vocabulary_record_id("u1", "안녕", "ko", "en")
+    assert requests[-1]["body"]["count+"] == 1
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_list_projection_and_skip_total():
+    """Test that list queries forward field projection and skipTotal."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json={"items": [], "totalItems": -1})
+
+    pb = make_client(handler)
+    await pb.get_user_vocabulary("u1", "t", fields=["word", "count"], skip_total=True)
+    await pb.get_user_translations("u1", "t")
+
+    projected, default = (r.url.params for r in calls)
+    assert projected["fields"] == "word,count"
+    assert projected["skipTotal"] == "1"
+    assert projected["filter"] == "user.id='u1'"
+    assert "fields" not in default and "skipTotal" not in default
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_iter_records_walks_pages_by_keyset():
+    """Test that the paginator yields every record once using keyset cursors."""
+    import re
+
+    records = [
+        {"id": f"r{i:03d}", "created": f"2024-01-01 00:00:{i // 3:02d}.000Z"}
+        for i in range(25)
+    ]
+    newest_first = sorted(records, key=lambda r: (r["created"], r["id"]), reverse=True)
+    filters = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        filters.append(params["filter"])
+        assert params["page"] == "1" and params["skipTotal"] == "1"
+        items = newest_first
+        cursor = re.search(r"created < '([^']+)' \|\| \(created = '[^']+' && id < '([^']+)'\)", params["filter"])
+        if cursor:
+            after = (cursor.group(1), cursor.group(2))
+            items = [r for r in items if (r["created"], r["id"]) < after]
+        return httpx.Response(200, json={"items": items[:int(params["perPage"])]})
+
+    pb = make_client(handler)
+    seen = [r async for r in pb.iter_records("translations", "t", "user.id='u1'", page_size=10)]
+
+    assert seen == newest_first
+    assert len(filters) == 3
+    assert all(f.startswith("(user.id='u1')") for f in filters)
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_delete_losing_a_race_reports_not_found():
+    """Test that a translation deleted concurrently makes the delete return False."""
+    gets = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/batch":
+            return httpx.Response(400, json={"message": "Batch transaction failed.", "data": {}})
+        gets.append(request.url.path)
+        if len(gets) == 1:
+            return httpx.Response(200, json={
+                "user": "u1", "created": "2024-01-01 10:00:00.000Z", "source_lang": "ko", "target_lang": "en"
+            })
+        return httpx.Response(404, json={"message": "Not found."})
+
+    pb = make_client(handler, admin_token="admin-token")
+    assert await pb.delete_translation("t1", "user-token") is False
+    assert len(gets) == 2
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_revoked_admin_token_is_replaced_and_request_retried():
+    """Test that a 401 on a superuser request re-authenticates once and retries."""
+    revoked, fresh = make_token(3600), make_token(7200)
+    tokens = [revoked, fresh]
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "auth-with-password" in request.url.path:
+            return httpx.Response(200, json={"token": tokens.pop(0)})
+        seen.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == f"Bearer {revoked}":
+            return httpx.Response(401, json={"message": "The request requires valid record authorization token."})
+        return httpx.Response(200, json={"items": [], "totalItems": 0})
+
+    pb = make_client(handler)
+    assert await pb.count_records("translations", "") == 0
+    assert seen == [f"Bearer {revoked}", f"Bearer {fresh}"]
+    assert pb.admin_token == fresh
+    await pb.close()
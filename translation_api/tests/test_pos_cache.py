@@ -0,0 +1,61 @@
+"""
+Unit tests for the morphological-analysis cache.
+Run with: pytest
+"""
+from services.pos_cache import PosCache
+
+
+def make_analyzer(calls):
+    def analyze(text):
+        calls.append(text)
+        return [["학교", "Noun"], ["에", "Josa"]]
+    return analyze
+
+
+def test_repeats_are_served_from_memory():
+    """Test that a sentence is analyzed once per backend."""
+    calls = []
+    cache = PosCache(max_entries=100, max_bytes=1024 * 1024, ttl=60)
+
+    for _ in range(3):
+        assert cache.get_or_analyze("학교에", "okt", make_analyzer(calls)) == (("학교", "Noun"), ("에", "Josa"))
+    cache.get_or_analyze("학교에", "kiwi", make_analyzer(calls))
+
+    assert calls == ["학교에", "학교에"]
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_memory_bound_evicts_and_disk_tier_survives_restart(tmp_path):
+    """Test byte-bounded eviction and reuse of the persistent tier."""
+    path = str(tmp_path / "pos.sqlite3")
+    calls = []
+    cache = PosCache(max_entries=100, max_bytes=1000, ttl=60, db_path=path)
+    for i in range(10):
+        cache.get_or_analyze(f"문장 {i}", "okt", make_analyzer(calls))
+    assert cache.stats()["bytes"] <= 1000
+    assert cache.stats()["evictions"] > 0
+    cache.close()
+
+    restarted = PosCache(max_entries=100, max_bytes=1000, ttl=60, db_path=path)
+    restarted.get_or_analyze("문장 0", "okt", make_analyzer(calls))
+    assert len(calls) == 10
+    restarted.close()
+
+
+def test_batch_analyzes_only_the_misses_in_one_call():
+    """Test that a batch lookup sends the uncached texts to the analyzer together."""
+    calls = []
+    cache = PosCache(max_entries=100, max_bytes=1024 * 1024, ttl=60)
+    cache.get_or_analyze("학교에", "okt", make_analyzer([]))
+
+    def analyze_many(texts):
+        calls.append(texts)
+        return [[["학교", "Noun"]] for _ in texts]
+
+    tags = cache.get_or_analyze_many(["학교에", "문장 1", "문장 2"], "okt", analyze_many)
+    assert calls == [["문장 1", "문장 2"]]
+    assert tags[0] == (("학교", "Noun"), ("에", "Josa")) and tags[2] == (("학교", "Noun"),)
+    assert cache.get_or_analyze_many(["문장 2"], "okt", analyze_many) == [(("학교", "Noun"),)]
+    assert len(calls) == 1
@@ -0,0 +1,69 @@
+"""
+Unit tests for request coalescing.
+Run with: pytest
+"""
+import asyncio
+
+import pytest
+
+from core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_upstream_call():
+    """Test that identical concurrent calls run the function once."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", fetch) for _ in range(10)))
+
+    assert results == ["result"] * 10
+    assert len(calls) == 1
+    assert flight.stats() == {"calls": 1, "coalesced": 9, "in_flight": 0}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    """Test that one caller giving up leaves the call running for others."""
+    flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def fetch():
+        started.set()
+        await asyncio.sleep(0.02)
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    await started.wait()
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "result"
+    assert first.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_shared_call_cancelled_when_no_waiters_remain():
+    """Test that the upstream call is cancelled once every caller gave up."""
+    flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def fetch():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    caller = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    caller.cancel()
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    await asyncio.sleep(0)
+    assert flight.stats()["in_flight"] == 0
@@ -0,0 +1,74 @@
+"""
+Unit tests for the fuzzy translation memory.
+Run with: pytest
+"""
+from services.translation_memory import TranslationMemory, match_text
+
+
+def test_match_text_ignores_punctuation_and_case():
+    """Test that inputs differing only in punctuation match exactly."""
+    assert match_text("  Hello,   World!! ") == "hello world"
+
+
+def test_lookup_scores_near_duplicates():
+    """Test that near-duplicates match with a score and unrelated texts don't."""
+    memory = TranslationMemory(threshold=0.6, max_entries=100)
+    memory.add("저는 매일 아침 학교에 갑니다.", "I go to school every morning.", "ko", "en")
+
+    exact = memory.lookup("저는 매일 아침 학교에 갑니다!", "ko", "en")
+    assert exact.translated_text == "I go to school every morning."
+    assert exact.score == 1.0
+
+    near = memory.lookup("저는 매일 아침 학교로 갑니다", "ko", "en")
+    assert near is not None and 0.6 <= near.score < 1.0
+
+    assert memory.lookup("오늘은 날씨가 좋네요", "ko", "en") is None
+    assert memory.lookup("저는 매일 아침 학교에 갑니다", "ko", "ja") is None
+    assert memory.stats() == {"size": 1, "hits": 2, "misses": 2}
+
+
+def test_add_is_incremental_and_bounded():
+    """Test that new entries are searchable at once and the oldest are evicted."""
+    memory = TranslationMemory(threshold=0.9, max_entries=2)
+    for word, meaning in [("사과", "apple"), ("학교", "school"), ("공부", "study")]:
+        memory.add(word, meaning, "ko", "en")
+
+    assert len(memory) == 2
+    assert memory.lookup("사과", "ko", "en") is None
+    assert memory.lookup("공부", "ko", "en").translated_text == "study"
+    assert not any(key[2] == "사과" for bucket in memory._buckets.values() for key in bucket)
+
+
+async def test_load_indexes_cached_provider_translations(monkeypatch, tmp_path):
+    """Test that startup loading reads the translation cache and keeps live additions."""
+    from core.config import settings
+    from core.disk_cache import SQLiteCache
+    from services.translation_cache import translation_cache
+
+    monkeypatch.setattr(translation_cache, "disk", SQLiteCache(str(tmp_path / "cache.sqlite3"), ttl=60, max_entries=100))
+    monkeypatch.setattr(settings, "TRANSLATION_MEMORY_LOAD_ENTRIES", 2)
+    for text, translated in [("사과", "apple"), ("학교", "school"), ("공부", "study")]:
+        await translation_cache.set(text, "ko", "en", translated)
+
+    memory = TranslationMemory(threshold=0.9, max_entries=10)
+    memory.add("도서관", "library", "ko", "en")
+    assert await memory.load() == 3
+
+    assert memory.lookup("도서관", "ko", "en").translated_text == "library"
+    assert memory.lookup("공부", "ko", "en").translated_text == "study"
+    assert len(memory) == 3
+    translation_cache.disk.close()
+
+
+async def test_long_texts_skip_the_memory():
+    """Test that texts over the length cap are neither stored nor signed."""
+    memory = TranslationMemory(threshold=0.8, max_entries=10, max_text_chars=300)
+    long_text = "학교에 갑니다 " * 50
+
+    memory.add(long_text, "school", "ko", "en")
+    assert len(memory) == 0
+    assert await memory.lookup_async(long_text, "ko", "en") is None
+
+    memory.add(long_text[:200], "school", "ko", "en")
+    match = await memory.lookup_async(long_text[:200] + "!", "ko", "en")
+    assert match.translated_text == "school"
@@ -0,0 +1,119 @@
+"""
+Unit tests for the translation provider chain.
+Run with: pytest
+"""
+import asyncio
+
+import pytest
+
+from services.papago import PapagoError
+from services.translation_providers import (
+    DictionaryProvider,
+    ProviderChain,
+    ProviderError,
+    TranslationProvider,
+)
+
+
+class FakeProvider(TranslationProvider):
+    def __init__(self, name, result=None, error=None, delay=0.0):
+        super().__init__()
+        self.name = name
+        self.result = result
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def translate(self, text, source_lang, target_lang):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_fails_over_and_opens_circuit():
+    """Test failover to the next provider and skipping a tripped provider."""
+    broken = FakeProvider("papago", error=PapagoError(503, "down"))
+    broken.health.failure_threshold = 2
+    offline = DictionaryProvider({"ko-en": {"안녕 하세요": "Hello"}})
+    chain = ProviderChain([broken, offline])
+
+    for _ in range(3):
+        assert await chain.translate(" 안녕  하세요", "ko", "en") == "Hello"
+
+    assert broken.calls == 2
+    assert not broken.health.available()
+    assert chain.stats()["providers"]["dictionary"]["successes"] == 3
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_fail_over():
+    """Test that request errors surface unchanged and don't trip the circuit."""
+    primary = FakeProvider("papago", error=PapagoError(400, "bad language"))
+    backup = FakeProvider("backup", result="x")
+    chain = ProviderChain([primary, backup])
+
+    with pytest.raises(PapagoError):
+        await chain.translate("안녕", "ko", "xx")
+    assert backup.calls == 0
+    assert primary.health.failures == 0
+
+
+@pytest.mark.asyncio
+async def test_all_circuits_open_raises_provider_error():
+    """Test that a chain with no available provider fails fast."""
+    provider = FakeProvider("papago", error=PapagoError(500, "boom"))
+    provider.health.failure_threshold = 1
+    chain = ProviderChain([provider])
+
+    with pytest.raises(PapagoError):
+        await chain.translate("안녕", "ko", "en")
+    with pytest.raises(ProviderError):
+        await chain.translate("안녕", "ko", "en")
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_primary():
+    """Test that a primary slower than its usual latency is raced."""
+    slow = FakeProvider("papago", result="slow", delay=0.5)
+    fast = FakeProvider("backup", result="fast")
+    for _ in range(5):
+        slow.health.record_success(0.01)
+    chain = ProviderChain([slow, fast], hedge=True, hedge_min_samples=5)
+
+    assert await chain.translate("안녕", "ko", "en") == "fast"
+    assert chain.hedges == 1
+    assert fast.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_dictionary_misses_fall_through_without_tripping_the_circuit():
+    """Test that a phrase missing from the dictionary isn't counted as a failure."""
+    offline = DictionaryProvider({"ko-en": {"안녕": "Hi"}})
+    offline.health.failure_threshold = 1
+    backup = FakeProvider("backup", result="school")
+    chain = ProviderChain([offline, backup])
+
+    for _ in range(3):
+        assert await chain.translate("학교", "ko", "en") == "school"
+    assert await chain.translate("안녕", "ko", "en") == "Hi"
+    assert offline.health.failures == 0 and offline.health.available()
+
+
+@pytest.mark.asyncio
+async def test_half_open_circuit_lets_one_trial_call_through():
+    """Test that only a single caller probes a provider whose circuit is half-open."""
+    flaky = FakeProvider("papago", result="school", delay=0.05)
+    flaky.health.failure_threshold = 1
+    flaky.health.reset_seconds = 0.0
+    flaky.health.record_failure()
+    backup = FakeProvider("backup", result="school")
+    chain = ProviderChain([flaky, backup])
+
+    results = await asyncio.gather(*(chain.translate("학교", "ko", "en") for _ in range(5)))
+
+    assert results == ["school"] * 5
+    assert flaky.calls == 1 and backup.calls == 4
+    assert flaky.health.open_until == 0.0 and not flaky.health.probing
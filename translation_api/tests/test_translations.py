@@ -0,0 +1,261 @@
+"""
+Unit tests for translation endpoints.
+Run with: pytest
+"""
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from core.pocketbase_client import pocketbase
+from routers.translations import _summarize
+from services.translation_cache import translation_cache
+
+
+@pytest.fixture(autouse=True)
+def no_shared_cache(monkeypatch):
+    monkeypatch.setattr(translation_cache, "disk", None)
+    translation_cache.memory.clear()
+    yield
+    translation_cache.memory.clear()
+
+
+@pytest.fixture
+async def mock_pocketbase(monkeypatch):
+    """Route the shared PocketBase client to a handler; the client is closed after the test."""
+    clients = []
+
+    def install(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        monkeypatch.setattr(pocketbase, "client", client)
+        monkeypatch.setattr(pocketbase, "admin_token", "admin-token")
+        monkeypatch.setattr(pocketbase, "admin_token_expires_at", time.time() + 3600)
+
+    yield install
+    for client in clients:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_summary_pushes_time_window_into_filters(mock_pocketbase):
+    """Test that summaries filter by time in PocketBase, not in Python."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if "translations" in request.url.path:
+            return httpx.Response(200, json={"items": [{"id": "t1"}], "totalItems": 7})
+        return httpx.Response(200, json={
+            "items": [{"word": "학교", "count": 3, "translation": "school"}],
+            "totalItems": 4
+        })
+
+    mock_pocketbase(handler)
+    since = datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc)
+    summary = await _summarize({"id": "u1", "token": "t"}, since)
+
+    assert summary == {
+        "total_translations": 7,
+        "unique_words": 4,
+        "most_frequent_words": [{"word": "학교", "count": 3, "translation": "school"}],
+    }
+    filters = {r.url.path.split("/")[3]: r.url.params["filter"] for r in calls}
+    assert filters["translations"] == "user.id='u1' && created >= '2024-05-01 09:30:00.000Z'"
+    assert filters["vocabulary"] == "user.id='u1' && last_reviewed >= '2024-05-01 09:30:00.000Z'"
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_local_day_boundaries(mock_pocketbase):
+    """Test that "today" is counted from local midnight, not UTC midnight."""
+    from zoneinfo import ZoneInfo
+    from services.stats_rollup import get_translation_stats
+
+    rows = [
+        # 2024-05-06 is a Monday; Seoul is UTC+9
+        {"id": "a", "slot": "2024-05-06 14:45:00.000Z", "count": 2},  # Mon 23:45 KST
+        {"id": "b", "slot": "2024-05-06 15:00:00.000Z", "count": 3},  # Tue 00:00 KST
+        {"id": "c", "slot": "2024-05-07 01:15:00.000Z", "count": 1},  # Tue 10:15 KST
+    ]
+    totals = [
+        {"source_lang": "ko", "target_lang": "en", "count": 40},
+        {"source_lang": "en", "target_lang": "ko", "count": 2},
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        flt = request.url.params["filter"]
+        if "slot = ''" in flt:
+            return httpx.Response(200, json={"items": totals})
+        assert "slot >= '2024-05-05 15:00:00.000Z'" in flt
+        return httpx.Response(200, json={"items": rows})
+
+    mock_pocketbase(handler)
+    now = datetime(2024, 5, 7, 3, 0, tzinfo=timezone.utc)  # Tue 12:00 KST
+    stats = await get_translation_stats("u1", "t", ZoneInfo("Asia/Seoul"), now=now)
+
+    assert stats.today == 4
+    assert stats.this_week == 6
+    assert stats.total_translations == 42
+    assert stats.korean_to_english == 40
+    assert stats.english_to_korean == 2
+
+
+@pytest.mark.asyncio
+async def test_proxy_save_persists_in_background(monkeypatch, mock_pocketbase):
+    """Test that proxy?save answers first and saves through the queue."""
+    from core.background_queue import BackgroundQueue
+    from routers import translations
+    from schemas.translation import TranslationRequest
+    from services import persistence
+
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=[{"status": 200, "body": {"id": "t1"}}])
+
+    async def fake_translate(text, source_lang, target_lang):
+        return "school", None
+
+    queue = BackgroundQueue(max_size=10, workers=1, max_retries=0, backoff=0)
+    mock_pocketbase(handler)
+    monkeypatch.setattr(translations.translator, "translate_with_memory", fake_translate)
+    monkeypatch.setattr(persistence, "persist_queue", queue)
+
+    request = TranslationRequest(text="학교", source_lang="ko", target_lang="en", save=True)
+    response = await translations.proxy_translation(request, {"id": "u1", "token": "t"})
+
+    assert response == {"translatedText": "school", "matchScore": None}
+    assert calls == []
+    await queue.drain(timeout=1.0)
+    assert calls == ["/api/batch"]
+
+
+@pytest.mark.asyncio
+async def test_saved_translations_never_enter_the_shared_memory(monkeypatch, mock_pocketbase):
+    """Test that user-supplied and fuzzy-matched translations aren't indexed."""
+    from core.background_queue import BackgroundQueue
+    from routers import translations
+    from schemas.translation import TranslationCreate, TranslationRequest
+    from services import persistence
+    from services.translation_memory import TranslationMemory
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[{"status": 200, "body": {
+            "id": "t1", "user_id": "u1", "source_text": "학교", "translated_text": "hacked",
+            "source_lang": "ko", "target_lang": "en",
+            "created": "2024-01-01 00:00:00.000Z", "updated": "2024-01-01 00:00:00.000Z"
+        }}])
+
+    queue = BackgroundQueue(max_size=10, workers=1, max_retries=0, backoff=0)
+    memory = TranslationMemory(threshold=0.6, max_entries=10)
+    memory.add("저는 매일 아침 학교에 갑니다.", "I go to school every morning.", "ko", "en")
+    mock_pocketbase(handler)
+    monkeypatch.setattr(translations.translator, "translation_memory", memory)
+    monkeypatch.setattr(persistence, "persist_queue", queue)
+    user = {"id": "u1", "token": "t"}
+
+    await translations.create_translation(TranslationCreate(
+        source_text="학교", translated_text="hacked", source_lang="ko", target_lang="en"
+    ), user)
+    near = TranslationRequest(text="저는 매일 아침 학교로 갑니다", source_lang="ko", target_lang="en", save=True)
+    response = await translations.proxy_translation(near, user)
+    await queue.drain(timeout=1.0)
+
+    assert response["matchScore"] < 1.0
+    assert memory.lookup("학교", "ko", "en") is None
+    assert len(memory) == 1
+
+
+@pytest.mark.asyncio
+async def test_background_save_retry_does_not_duplicate_a_committed_save(monkeypatch, mock_pocketbase):
+    """Test that a save whose response was lost after the commit isn't sent again."""
+    import json
+    from core.background_queue import BackgroundQueue
+    from services import persistence
+
+    saved = {}
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if request.url.path == "/api/batch":
+            record = json.loads(request.content)["requests"][0]["body"]
+            saved[record["id"]] = record
+            return httpx.Response(504)  # Committed, but the response never arrived
+        record_id = request.url.path.rsplit("/", 1)[-1]
+        if record_id not in saved:
+            return httpx.Response(404)
+        return httpx.Response(200, json=saved[record_id])
+
+    queue = BackgroundQueue(max_size=10, workers=1, max_retries=2, backoff=0.001)
+    mock_pocketbase(handler)
+    monkeypatch.setattr(persistence, "persist_queue", queue)
+
+    await persistence.save_translation_later("u1", "학교", "school", "ko", "en", "t")
+    await queue.drain(timeout=1.0)
+
+    assert calls == ["POST", "GET"]
+    assert len(saved) == 1
+    assert queue.stats()["completed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_proxy_returns_the_translation_when_an_inline_save_fails(monkeypatch, mock_pocketbase):
+    """Test that a full queue's inline save can't turn a translation into a 500."""
+    from core.background_queue import BackgroundQueue
+    from routers import translations
+    from schemas.translation import TranslationRequest
+    from services import persistence
+
+    async def fake_translate(text, source_lang, target_lang):
+        return "school", None
+
+    queue = BackgroundQueue(max_size=1, workers=1, max_retries=0, backoff=0)
+    queue.submit = lambda job: False  # Always full
+    mock_pocketbase(lambda request: httpx.Response(503))
+    monkeypatch.setattr(translations.translator, "translate_with_memory", fake_translate)
+    monkeypatch.setattr(persistence, "persist_queue", queue)
+
+    request = TranslationRequest(text="학교", source_lang="ko", target_lang="en", save=True)
+    response = await translations.proxy_translation(request, {"id": "u1", "token": "t"})
+
+    assert response == {"translatedText": "school", "matchScore": None}
+    assert queue.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_save_persists_the_joined_translation(monkeypatch, mock_pocketbase):
+    """Test that /proxy/stream honors `save` once the whole text is translated."""
+    import json
+    from types import SimpleNamespace
+    from core.background_queue import BackgroundQueue
+    from routers import translations
+    from schemas.translation import TranslationRequest
+    from services import persistence
+
+    saved = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        saved.append(json.loads(request.content)["requests"][0]["body"])
+        return httpx.Response(200, json=[{"status": 200, "body": {"id": "t1"}}])
+
+    async def fake_stream(text, source_lang, target_lang, window):
+        for index, segment in enumerate(translations.translator.split_sentences(text, 100)):
+            yield index, segment, segment.text.upper()
+
+    queue = BackgroundQueue(max_size=10, workers=1, max_retries=0, backoff=0)
+    mock_pocketbase(handler)
+    monkeypatch.setattr(translations.translator, "translate_stream", fake_stream)
+    monkeypatch.setattr(persistence, "persist_queue", queue)
+
+    request = TranslationRequest(text="One. Two.", source_lang="en", target_lang="ko", save=True)
+    response = await translations.proxy_translation_stream(
+        request, SimpleNamespace(headers={}), {"id": "u1", "token": "t"}
+    )
+    lines = [line async for line in response.body_iterator]
+    await queue.drain(timeout=1.0)
+
+    assert len(lines) == 2
+    assert [(body["source_text"], body["translated_text"]) for body in saved] == [("One. Two.", "ONE. TWO.")]
@@ -0,0 +1,177 @@
+"""
+Unit tests for the translation service.
+Run with: pytest
+"""
+import pytest
+
+from core.token_bucket import SharedTokenBuckets
+from services import translator
+from services.papago import PapagoError, papago
+from services.papago_quota import papago_quota
+from services.translation_cache import normalize_text, translation_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(monkeypatch):
+    monkeypatch.setattr(translation_cache, "disk", None)
+    monkeypatch.setattr(papago_quota, "buckets", SharedTokenBuckets(":memory:"))
+    translation_cache.memory.clear()
+    yield
+    translation_cache.memory.clear()
+
+
+def test_normalize_text_collapses_whitespace_and_composes():
+    """Test that equivalent inputs share one cache key."""
+    decomposed = "\u1112\u1161\u11ab"  # 한 as conjoining jamo
+    assert normalize_text(f"  {decomposed}\n\t국어  ") == "한 국어"
+
+
+@pytest.mark.asyncio
+async def test_translate_serves_repeats_from_cache(monkeypatch):
+    """Test that a repeated phrase only reaches Papago once."""
+    calls = []
+
+    async def fake_translate(text, source_lang, target_lang):
+        calls.append(text)
+        return "Hello"
+
+    monkeypatch.setattr(papago, "translate", fake_translate)
+    assert await translator.translate("안녕 하세요", "ko", "en") == "Hello"
+    assert await translator.translate(" 안녕  하세요 ", "ko", "en") == "Hello"
+    assert calls == ["안녕 하세요"]
+    assert translation_cache.stats()["memory"]["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_translate_does_not_cache_errors(monkeypatch):
+    """Test that Papago failures are retried on the next request."""
+    async def failing_translate(text, source_lang, target_lang):
+        raise PapagoError(500, "boom")
+
+    monkeypatch.setattr(papago, "translate", failing_translate)
+    with pytest.raises(PapagoError):
+        await translator.translate("안녕", "ko", "en")
+    assert await translation_cache.get("안녕", "ko", "en") is None
+
+
+@pytest.mark.asyncio
+async def test_shared_tier_survives_restart(monkeypatch, tmp_path):
+    """Test that a fresh worker is warmed from the shared on-disk tier."""
+    from core.disk_cache import SQLiteCache
+
+    path = str(tmp_path / "cache.sqlite3")
+    monkeypatch.setattr(translation_cache, "disk", SQLiteCache(path, ttl=60, max_entries=100))
+    await translation_cache.set("학교", "ko", "en", "school")
+    translation_cache.close()
+
+    translation_cache.memory.clear()
+    monkeypatch.setattr(translation_cache, "disk", SQLiteCache(path, ttl=60, max_entries=100))
+    assert await translation_cache.warm() == 1
+    assert translation_cache.memory.get(("학교", "ko", "en")) == "school"
+    translation_cache.close()
+
+
+def test_pack_texts_respects_character_limit():
+    """Test that packs stay within the limit including separators."""
+    packs = translator.pack_texts(["aaaa", "bbb", "cc", "d"], max_chars=8)
+    assert packs == [["aaaa", "bbb"], ["cc", "d"]]
+    assert all(len("\n".join(pack)) <= 8 for pack in packs)
+
+
+@pytest.mark.asyncio
+async def test_translate_many_dedupes_packs_and_keeps_order(monkeypatch):
+    """Test that a batch becomes one packed request and keeps input order."""
+    calls = []
+
+    async def fake_translate(text, source_lang, target_lang):
+        calls.append(text)
+        return "\n".join(f"<{line}>" for line in text.split("\n"))
+
+    monkeypatch.setattr(papago, "translate", fake_translate)
+    await translation_cache.set("사과", "ko", "en", "apple")
+
+    results = await translator.translate_many(
+        ["학교", "사과", " 학교 ", "공부"], "ko", "en"
+    )
+
+    assert results == ["<학교>", "apple", "<학교>", "<공부>"]
+    assert calls == ["학교\n공부"]
+    assert await translation_cache.get("공부", "ko", "en") == "<공부>"
+
+
+@pytest.mark.asyncio
+async def test_translate_many_falls_back_and_reports_item_errors(monkeypatch):
+    """Test per-text fallback when Papago merges lines, with per-item errors."""
+    async def fake_translate(text, source_lang, target_lang):
+        if "\n" in text:
+            return text.replace("\n", " ")
+        if text == "실패":
+            raise PapagoError(400, "bad text")
+        return f"<{text}>"
+
+    monkeypatch.setattr(papago, "translate", fake_translate)
+    results = await translator.translate_many(["학교", "실패"], "ko", "en")
+
+    assert results[0] == "<학교>"
+    assert isinstance(results[1], PapagoError)
+
+
+def test_split_sentences_keeps_separators_and_limit():
+    """Test sentence segmentation, whitespace round-trip and overlong cuts."""
+    text = "안녕하세요. 저는 학생입니다!\n\n오늘은 날씨가 좋네요"
+    segments = translator.split_sentences(text, max_chars=100)
+    assert [s.text for s in segments] == ["안녕하세요.", "저는 학생입니다!", "오늘은 날씨가 좋네요"]
+    assert "".join(s.text + s.separator for s in segments) == text
+
+    long_segments = translator.split_sentences("aaa bbb ccc ddd", max_chars=8)
+    assert [s.text for s in long_segments] == ["aaa bbb", "ccc ddd"]
+
+
+@pytest.mark.asyncio
+async def test_translate_stream_yields_in_order_with_bounded_window(monkeypatch):
+    """Test that results stream in input order with limited concurrency."""
+    import asyncio
+
+    in_flight = []
+    peak = []
+
+    async def fake_translate(text, source_lang, target_lang):
+        in_flight.append(text)
+        peak.append(len(in_flight))
+        # Later sentences finish first
+        await asyncio.sleep(0.01 * (10 - int(text[1])))
+        in_flight.remove(text)
+        return text.upper()
+
+    monkeypatch.setattr(papago, "translate", fake_translate)
+    text = " ".join(f"s{i}." for i in range(8))
+    results = [
+        (index, result)
+        async for index, _, result in translator.translate_stream(text, "en", "ko", window=3)
+    ]
+
+    assert results == [(i, f"S{i}.") for i in range(8)]
+    assert max(peak) <= 3
+
+
+@pytest.mark.asyncio
+async def test_exact_cache_hit_beats_a_fuzzy_memory_match(monkeypatch):
+    """Test that the memory is only consulted on a cache miss."""
+    from services.translation_memory import TranslationMemory
+
+    async def fake_translate(text, source_lang, target_lang):
+        return "I go to school by bus every morning."
+
+    memory = TranslationMemory(threshold=0.6, max_entries=10)
+    memory.add("저는 매일 아침 학교에 갑니다.", "I go to school every morning.", "ko", "en")
+    monkeypatch.setattr(translator, "translation_memory", memory)
+    monkeypatch.setattr(papago, "translate", fake_translate)
+    await translation_cache.set("저는 매일 아침 버스로 학교에 갑니다.", "ko", "en",
+                                "I go to school by bus every morning.")
+
+    assert await translator.translate_with_memory("저는 매일 아침 버스로 학교에 갑니다.", "ko", "en") == (
+        "I go to school by bus every morning.", None
+    )
+    translated, score = await translator.translate_with_memory("저는 매일 아침 학교로 갑니다", "ko", "en")
+    assert translated == "I go to school every morning." and 0.6 <= score < 1.0
+    assert memory.stats()["hits"] == 1
@@ -0,0 +1,148 @@
+"""
+Concurrency stress test for the vocabulary counter upsert.
+Run with: pytest
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from core.config import settings
+from core.pocketbase_client import PocketBaseClient
+
+
+class FakePocketBase:
+    """
+    In-memory stand-in for PocketBase's batch endpoint.
+
+    Each batch reads the row, yields to let other transactions interleave,
+    and commits only if nobody else wrote the row in between, mirroring
+    how SQLite rejects a stale write transaction.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.versions = {}
+        self.conflicts = 0
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/collections/vocabulary/records":
+            return httpx.Response(200, json={"items": []})
+
+        (upsert,) = json.loads(request.content)["requests"]
+        body = upsert["body"]
+        record_id = body["id"]
+        version = self.versions.get(record_id, 0)
+        current = self.rows.get(record_id, {"count": 0})
+
+        await asyncio.sleep(0)
+
+        if self.versions.get(record_id, 0) != version:
+            self.conflicts += 1
+            return httpx.Response(400, json={
+                "message": "Batch transaction failed.",
+                "data": {"requests": {"0": {"code": "batch_request_failed", "response": {
+                    "status": 400, "data": {"id": {"code": "validation_not_unique"}}
+                }}}}
+            })
+
+        row = {**current, "id": record_id, "word": body["word"]}
+        row["count"] = current["count"] + body["count+"]
+        self.rows[record_id] = row
+        self.versions[record_id] = version + 1
+        return httpx.Response(200, json=[{"status": 200, "body": row}])
+
+
+@pytest.mark.asyncio
+async def test_parallel_vocabulary_saves_count_exactly(monkeypatch):
+    """Test that hundreds of concurrent saves produce exact counts."""
+    monkeypatch.setattr(settings, "POCKETBASE_UPSERT_MAX_RETRIES", 100)
+    monkeypatch.setattr(settings, "POCKETBASE_UPSERT_RETRY_BACKOFF", 0.001)
+
+    fake = FakePocketBase()
+    pb = PocketBaseClient()
+    pb.client = httpx.AsyncClient(transport=httpx.MockTransport(fake.handle))
+
+    words = ["사과", "학교", "공부"]
+    saves_per_word = 100
+    await asyncio.gather(*(
+        pb.create_or_update_vocabulary("u1", word, "tr", "ko", "en", token="t")
+        for word in words
+        for _ in range(saves_per_word)
+    ))
+
+    assert fake.conflicts > 0
+    assert len(fake.rows) == len(words)
+    assert sorted(row["count"] for row in fake.rows.values()) == [saves_per_word] * len(words)
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_permanent_batch_errors_are_not_retried():
+    """Test that a validation error fails at once instead of after backoff retries."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(400, json={"message": "Batch requests are not allowed."})
+
+    pb = PocketBaseClient()
+    pb.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        await pb.create_or_update_vocabulary("u1", "사과", "apple", "ko", "en", token="t")
+    assert calls == ["/api/batch"]
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_row_is_remembered_after_the_first_conflict():
+    """Test that a row with a pre-deterministic id costs one lookup, not one per save."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/api/collections/vocabulary/records":
+            calls.append("find")
+            return httpx.Response(200, json={"items": [{"id": "legacy123456789"}]})
+        (upsert,) = json.loads(request.content)["requests"]
+        calls.append(upsert["method"])
+        if upsert["method"] == "PUT":
+            return httpx.Response(400, json={"data": {"word": {"code": "validation_not_unique"}}})
+        return httpx.Response(200, json=[{"status": 200, "body": {"id": "legacy123456789"}}])
+
+    pb = PocketBaseClient()
+    pb.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    for _ in range(3):
+        result = await pb.create_or_update_vocabulary("u1", "사과", "apple", "ko", "en", token="t")
+        assert result["id"] == "legacy123456789"
+    assert calls == ["PUT", "find", "PATCH", "PATCH", "PATCH"]
+    await pb.close()
+
+
+@pytest.mark.asyncio
+async def test_remembered_legacy_row_survives_unrelated_errors():
+    """Test that only a 404/400 on the legacy PATCH forgets the row and re-runs the batch."""
+    calls = []
+    statuses = [503, 404]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        (upsert,) = json.loads(request.content)["requests"]
+        calls.append(upsert["method"])
+        if upsert["method"] == "PATCH":
+            return httpx.Response(statuses.pop(0), json={})
+        return httpx.Response(200, json=[{"status": 200, "body": {"id": "new"}}])
+
+    pb = PocketBaseClient()
+    pb.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    key = ("u1", "사과", "ko", "en")
+    pb.legacy_vocabulary_ids.set(key, "legacy123456789")
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await pb.create_or_update_vocabulary("u1", "사과", "apple", "ko", "en", token="t")
+    assert pb.legacy_vocabulary_ids.get(key) == "legacy123456789"
+
+    result = await pb.create_or_update_vocabulary("u1", "사과", "apple", "ko", "en", token="t")
+    assert result["id"] == "new"
+    assert pb.legacy_vocabulary_ids.get(key) is None
+    assert calls == ["PATCH", "PATCH", "PUT"]
+    await pb.close()